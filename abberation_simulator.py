@@ -1,6 +1,10 @@
+import io
 import streamlit as st
 import numpy as np
 import matplotlib.pyplot as plt
+from PIL import Image
+from sky_renderer import render_sky, synthetic_panorama
+from star_catalogue import density_raster, load_catalogue, synthetic_catalogue, to_image
 
 # 1. Page config
 st.set_page_config(
@@ -41,48 +45,140 @@ beta = np.clip(beta, 0.0, 1 - epsilon)
 st.markdown(f"**You entered:** β = {beta:.9f}")
 
 
-# 5. Generate random starfield
-num_stars = 500
-theta = np.random.uniform(0, np.pi, num_stars)
-phi   = np.random.uniform(0, 2 * np.pi, num_stars)
+star_mode = st.radio("Star field", ["500 random stars", "Star catalogue (density map)"], horizontal=True)
+
+
+@st.cache_resource
+def default_catalogue():
+    return synthetic_catalogue(1_000_000, seed=0)
+
+
+@st.cache_data(max_entries=16)
+def catalogue_images(path, beta, size):
+    cat = load_catalogue(path) if path else default_catalogue()
+    rest = to_image(density_raster(cat, 0.0, size))
+    moving = to_image(density_raster(cat, beta, size))
+    return rest, moving, len(cat)
+
+
+if star_mode == "500 random stars":
+    # 5. Generate random starfield
+    num_stars = 500
+    theta = np.random.uniform(0, np.pi, num_stars)
+    phi   = np.random.uniform(0, 2 * np.pi, num_stars)
+
+    x = np.sin(theta) * np.cos(phi)
+    y = np.sin(theta) * np.sin(phi)
+    z = np.cos(theta)
+
+    # 6. Aberration transform
+    cos_tp = (z - beta) / (1 - beta * z)
+    cos_tp = np.clip(cos_tp, -1, 1)
+    theta_prime = np.arccos(cos_tp)
+
+    x_p = np.sin(theta_prime) * np.cos(phi)
+    y_p = np.sin(theta_prime) * np.sin(phi)
+
+    # 7. Force a dark style so white points show up
+    plt.style.use("dark_background")
+
+    # 8. Plot side by side
+    fig, (ax0, ax1) = plt.subplots(1, 2, figsize=(10, 5))
+    for ax, X, Y, title in [
+        (ax0, x,   y,   "Starfield in Rest Frame"),
+        (ax1, x_p, y_p, "Starfield in Moving Frame")
+    ]:
+        ax.scatter(X, Y, s=10, c="white")
+        ax.set_facecolor("black")
+        ax.set_title(title, color="white")
+        ax.axis("off")
+
+    # 9. Ensure the figure itself is black
+    fig.patch.set_facecolor("black")
+    plt.tight_layout()
+
+    # 10. Render in Streamlit
+    st.pyplot(fig)
+else:
+    # 5b. Catalogue mode: aberrate in chunks and bin into a density raster
+    st.markdown("""
+    Load an `.npy` catalogue of shape (N, 3) with columns RA (°), Dec (°) and magnitude — it is memory-mapped,
+    not read into RAM — or use the built-in seeded catalogue of one million stars. Each star adds its flux
+    $10^{-0.4m}$ to a pixel, so bright stars and dense regions both show up.
+    """)
+    cat_path = st.text_input("Path to a local catalogue (.npy, optional)", "")
+    raster_size = st.select_slider("Raster size (pixels)", [300, 600, 900], value=600)
+    try:
+        rest_img, moving_img, n_cat = catalogue_images(cat_path.strip(), float(beta), raster_size)
+    except (OSError, ValueError) as exc:
+        st.error(f"Could not load catalogue: {exc}")
+    else:
+        col_rest, col_moving = st.columns(2)
+        col_rest.image(rest_img, caption="Starfield in Rest Frame", use_container_width=True)
+        col_moving.image(moving_img, caption="Starfield in Moving Frame", use_container_width=True)
+        st.caption(f"{n_cat:,} stars binned into a {raster_size}×{raster_size} density map.")
 
-x = np.sin(theta) * np.cos(phi)
-y = np.sin(theta) * np.sin(phi)
-z = np.cos(theta)
+st.info("""
+At high speeds, stars appear to cluster toward the direction of motion —  
+a stunning effect of spacetime geometry.
+""")
 
-# 6. Aberration transform
-cos_tp = (z - beta) / (1 - beta * z)
-cos_tp = np.clip(cos_tp, -1, 1)
-theta_prime = np.arccos(cos_tp)
+# 11. Panoramic sky renderer
+st.subheader("🔭 What a Fast Observer Sees")
+st.markdown("""
+Take a full-sky (equirectangular) panorama and look at it while moving. Every output pixel is traced back
+through the inverse aberration formula, its colour is Doppler shifted by
+$D = 1 / [\\gamma (1 - \\beta \\cos\\theta')]$, and its brightness is beamed by $D^3$ (specific intensity)
+or $D^4$ (bolometric).
+""")
 
-x_p = np.sin(theta_prime) * np.cos(phi)
-y_p = np.sin(theta_prime) * np.sin(phi)
 
-# 7. Force a dark style so white points show up
-plt.style.use("dark_background")
+@st.cache_data(max_entries=4)
+def load_panorama(data):
+    return np.asarray(Image.open(data).convert("RGB"))
 
-# 8. Plot side by side
-fig, (ax0, ax1) = plt.subplots(1, 2, figsize=(10, 5))
-for ax, X, Y, title in [
-    (ax0, x,   y,   "Starfield in Rest Frame"),
-    (ax1, x_p, y_p, "Starfield in Moving Frame")
-]:
-    ax.scatter(X, Y, s=10, c="white")
-    ax.set_facecolor("black")
-    ax.set_title(title, color="white")
-    ax.axis("off")
 
-# 9. Ensure the figure itself is black
-fig.patch.set_facecolor("black")
-plt.tight_layout()
+@st.cache_resource
+def default_panorama():
+    return synthetic_panorama(1024, 2048)
 
-# 10. Render in Streamlit
-st.pyplot(fig)
 
-st.info("""
-At high speeds, stars appear to cluster toward the direction of motion —  
-a stunning effect of spacetime geometry.
-""")
+pano_file = st.file_uploader("Equirectangular panorama (optional)", type=["png", "jpg", "jpeg"])
+panorama = load_panorama(pano_file) if pano_file is not None else default_panorama()
+
+sky_col1, sky_col2 = st.columns(2)
+with sky_col1:
+    sky_beta = st.slider("Observer speed β", 0.0, 0.99, 0.5, 0.01)
+    beaming = st.radio("Beaming", ["specific", "bolometric", "none"], horizontal=True)
+with sky_col2:
+    azimuth = st.slider("Direction of motion: azimuth (°)", -180, 180, 0)
+    elevation = st.slider("Direction of motion: elevation (°)", -90, 90, 0)
+resolution = st.selectbox("Download resolution", ["960×480", "1920×960", "1920×1080"], index=0)
+exposure = st.slider("Exposure", 0.05, 4.0, 1.0, 0.05)
+
+# The preview is rendered at display width (~0.1–0.2 s per frame); full size only when downloaded.
+out_w, out_h = (int(n) for n in resolution.split("×"))
+preview_w = min(out_w, 960)
+preview_h = round(out_h * preview_w / out_w)
+az, el = np.radians(azimuth), np.radians(elevation)
+velocity = sky_beta * np.array([np.cos(el) * np.cos(az), np.cos(el) * np.sin(az), np.sin(el)])
+sky_beaming = None if beaming == "none" else beaming
+view, doppler = render_sky(panorama, velocity, out_shape=(preview_h, preview_w),
+                           beaming=sky_beaming, exposure=exposure)
+st.image(view, caption=f"Sky at β = {sky_beta:.2f} (direction of motion at the image centre for azimuth 0°)",
+         use_container_width=True)
+st.caption(f"Doppler factor across the sky: {doppler.min():.3f} (behind) to {doppler.max():.3f} (ahead)")
+
+
+def full_view_png():
+    full, _ = render_sky(panorama, velocity, out_shape=(out_h, out_w), beaming=sky_beaming, exposure=exposure)
+    buf = io.BytesIO()
+    Image.fromarray((full * 255).round().astype(np.uint8)).save(buf, format="PNG")
+    return buf.getvalue()
+
+
+st.download_button(f"Download {out_w}×{out_h} PNG", full_view_png, file_name=f"sky_beta_{sky_beta:.2f}.png",
+                   mime="image/png", on_click="ignore")
 
 st.markdown("""
 <hr style='margin-top: 50px; margin-bottom: 10px'>
@@ -0,0 +1,145 @@
+import time
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+from causal_index import DEFAULT_NULL_TOL, LIGHTLIKE, classify_intervals
+
+# Events are (t, x, y, z) rows; c defaults to 1. An edge i → j means j is in
+# the causal future of i (time-like or null, Δt > 0). Edges are limited to
+# Δt ≤ horizon: by the reverse triangle inequality the direct edge between
+# two events always has the most proper time, so the horizon is what makes
+# the maximal path a chain of local steps, like a worldline.
+
+MAX_CANDIDATES = 20_000_000  # candidate pairs before filtering; ~16 bytes each
+
+
+class CausalGraph:
+    """Causal DAG of an event set, stored as CSR adjacency over time-sorted events.
+
+    Candidate pairs come from one KD-tree pair query in (ct, x, y, z): any
+    future-directed edge with Δt ≤ horizon has 4D length ≤ √2·c·horizon, so
+    no O(N²) pair list is ever formed. The candidate count is estimated from
+    a sample first and a ValueError raised above max_candidates.
+    Sorting by t is itself a topological order, since every edge points
+    forward in time.
+    """
+
+    def __init__(self, events, horizon, c=1.0, null_tol=DEFAULT_NULL_TOL, max_candidates=MAX_CANDIDATES):
+        events = np.asarray(events, dtype=float)
+        if events.ndim != 2 or events.shape[1] != 4:
+            raise ValueError("Events must have shape (N, 4): t, x, y, z.")
+        self.c = float(c)
+        self.horizon = float(horizon)
+        self.order = np.argsort(events[:, 0], kind="stable")
+        self.events = events[self.order]
+        self.rank = np.empty_like(self.order)
+        self.rank[self.order] = np.arange(len(self.order))
+
+        scaled = self.events.copy()
+        scaled[:, 0] *= self.c
+        tree = cKDTree(scaled)
+        radius = np.sqrt(2) * self.c * self.horizon
+        # Estimate the candidate count from a sample before asking for the pairs.
+        sample = scaled[np.random.default_rng(0).choice(len(scaled), min(len(scaled), 4096), replace=False)]
+        per_event = (tree.count_neighbors(cKDTree(sample), radius) - len(sample)) / len(sample)
+        n_candidates = int(per_event * len(scaled) / 2)
+        if n_candidates > max_candidates:
+            raise ValueError(f"{n_candidates:,} candidate pairs exceed max_candidates={max_candidates:,}; "
+                             "use a shorter horizon.")
+        pairs = tree.query_pairs(radius, output_type="ndarray")
+        src, dst = pairs[:, 0], pairs[:, 1]  # src < dst, so t[src] ≤ t[dst]
+        d = self.events[dst] - self.events[src]
+        labels, s2 = classify_intervals(d[:, 0], np.einsum("ij,ij->i", d[:, 1:], d[:, 1:]), self.c, null_tol)
+        keep = (labels >= LIGHTLIKE) & (d[:, 0] > 0) & (d[:, 0] <= self.horizon)
+        src, dst = src[keep], dst[keep]
+        tau = np.sqrt(np.maximum(s2[keep], 0)) / self.c
+
+        by_src = np.lexsort((dst, src))
+        self.indices = dst[by_src]
+        self.tau = tau[by_src]
+        self.indptr = np.concatenate([[0], np.cumsum(np.bincount(src, minlength=len(events)))])
+
+    def __len__(self):
+        return len(self.events)
+
+    @property
+    def n_edges(self):
+        return len(self.indices)
+
+    def topological_order(self):
+        """Original indices in a causal order (every edge goes from earlier to later)."""
+        return self.order
+
+    def successors(self, i):
+        """Original indices of the direct successors of event i, with the proper time of each edge."""
+        p = self.rank[i]
+        s, e = self.indptr[p], self.indptr[p + 1]
+        return self.order[self.indices[s:e]], self.tau[s:e]
+
+    def longest_path(self, a, b, weight="proper_time"):
+        """Maximal path from event a to event b by dynamic programming in time order.
+
+        weight="proper_time" sums τ along the edges (the discrete geodesic);
+        weight="hops" counts edges (the longest chain, as in causal sets).
+        Returns (path as original indices, total) or (None, -inf) if b is
+        not reachable from a within the horizon-limited graph.
+        """
+        pa, pb = self.rank[a], self.rank[b]
+        if pb <= pa:
+            return None, -np.inf
+        n = pb - pa + 1
+        best = np.full(n, -np.inf)
+        pred = np.full(n, -1, dtype=np.int64)
+        best[0] = 0.0
+        for p in range(pa, pb):
+            here = best[p - pa]
+            if here == -np.inf:
+                continue
+            s, e = self.indptr[p], self.indptr[p + 1]
+            nb = self.indices[s:e]
+            stop = np.searchsorted(nb, pb, side="right")  # successors are sorted
+            nb = nb[:stop] - pa
+            cand = here + (self.tau[s:s + stop] if weight == "proper_time" else np.ones(stop))
+            better = cand > best[nb]
+            best[nb[better]] = cand[better]
+            pred[nb[better]] = p
+        if best[-1] == -np.inf:
+            return None, -np.inf
+        path = [pb]
+        while path[-1] != pa:
+            path.append(pred[path[-1] - pa])
+        return self.order[np.array(path[::-1])], float(best[-1])
+
+
+def sprinkle(n_events, duration, width, seed=0, dims=1):
+    """Seeded uniform events in t ∈ [0, duration] and a box of half-width `width` in `dims` space dimensions."""
+    rng = np.random.default_rng(seed)
+    events = np.zeros((n_events, 4))
+    events[:, 0] = rng.uniform(0, duration, n_events)
+    events[:, 1:1 + dims] = rng.uniform(-width, width, (n_events, dims))
+    return events
+
+
+def benchmark(n_events=100_000, horizon=0.1, seed=0):
+    """Build the graph of 1e5 events in 3+1D and find the maximal path across the set."""
+    events = sprinkle(n_events, 1.0, 0.5, seed=seed, dims=3)
+    events[0], events[1] = (0, 0, 0, 0), (1, 0, 0, 0)
+    t0 = time.perf_counter()
+    graph = CausalGraph(events, horizon)
+    t_build = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    path, tau = graph.longest_path(0, 1)
+    t_path = time.perf_counter() - t0
+    return {
+        "edges": graph.n_edges,
+        "build_s": t_build,
+        "path_s": t_path,
+        "path_events": 0 if path is None else len(path),
+        "path_tau": tau,
+    }
+
+
+if __name__ == "__main__":
+    for key, value in benchmark().items():
+        print(f"{key:>12}: {value:.4g}")
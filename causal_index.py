@@ -0,0 +1,150 @@
+from functools import lru_cache
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+# Events are (t, x, y, z) rows. c defaults to 1 (natural units); pass c=3e8
+# for seconds and metres. Interval labels follow the sign of
+# s² = c²Δt² − |Δr|² in the (+, −, −, −) signature.
+
+TIMELIKE, LIGHTLIKE, SPACELIKE = 1, 0, -1
+LABELS = {TIMELIKE: "time-like", LIGHTLIKE: "light-like", SPACELIKE: "space-like"}
+DEFAULT_NULL_TOL = 1e-9
+BUCKET_SIZE = 1 << 16
+
+
+def classify_intervals(dt, dr2, c=1.0, null_tol=DEFAULT_NULL_TOL):
+    """Label separations as TIMELIKE, LIGHTLIKE or SPACELIKE, vectorised.
+
+    dr2 is |Δr|². A separation is light-like when |s²| ≤ null_tol·(c²Δt² + |Δr|²),
+    so the tolerance is relative to the size of the separation and works
+    the same in metres or light-seconds. Returns (labels, s²).
+    """
+    ct2 = (c * np.asarray(dt, dtype=float)) ** 2
+    dr2 = np.asarray(dr2, dtype=float)
+    s2 = ct2 - dr2
+    labels = np.where(s2 > 0, TIMELIKE, SPACELIKE).astype(np.int8)
+    labels[np.abs(s2) <= null_tol * (ct2 + dr2)] = LIGHTLIKE
+    return labels, s2
+
+
+def classify_pairs(events, i, j, c=1.0, null_tol=DEFAULT_NULL_TOL, chunk=1 << 20):
+    """Classify the candidate pairs (events[i], events[j]) in chunks; returns (labels, s²)."""
+    events = np.asarray(events)
+    i, j = np.asarray(i), np.asarray(j)
+    labels = np.empty(len(i), dtype=np.int8)
+    s2 = np.empty(len(i))
+    for start in range(0, len(i), chunk):
+        sl = slice(start, start + chunk)
+        d = events[j[sl]] - events[i[sl]]
+        labels[sl], s2[sl] = classify_intervals(d[:, 0], np.einsum("ij,ij->i", d[:, 1:], d[:, 1:]), c, null_tol)
+    return labels, s2
+
+
+class CausalIndex:
+    """Events sorted by time and cut into buckets, each with a KD-tree over position.
+
+    A light-cone query only visits the buckets inside its time window and,
+    in each, only the ball of positions light could have crossed since the
+    apex, so its cost grows with the answer rather than the log size.
+    Trees are built lazily and the whole index can be saved and reloaded.
+    """
+
+    def __init__(self, events, c=1.0, bucket_size=BUCKET_SIZE, _sorted=False):
+        events = np.asarray(events, dtype=float)
+        if events.ndim != 2 or events.shape[1] != 4:
+            raise ValueError("Events must have shape (N, 4): t, x, y, z.")
+        if _sorted:
+            self.order = np.arange(len(events))
+        else:
+            self.order = np.argsort(events[:, 0], kind="stable")
+            events = events[self.order]
+        self.events = events
+        self.c = float(c)
+        self.bucket_size = int(bucket_size)
+        self.starts = np.arange(0, len(events), self.bucket_size)
+        self._trees = {}
+        self._rank = None
+
+    def __len__(self):
+        return len(self.events)
+
+    def save(self, path):
+        np.savez(path, events=self.events, order=self.order, c=self.c, bucket_size=self.bucket_size)
+
+    @classmethod
+    def load(cls, path):
+        data = np.load(path)
+        index = cls(data["events"], float(data["c"]), int(data["bucket_size"]), _sorted=True)
+        index.order = data["order"]
+        return index
+
+    def _tree(self, b):
+        if b not in self._trees:
+            start = self.starts[b]
+            self._trees[b] = cKDTree(self.events[start:start + self.bucket_size, 1:])
+        return self._trees[b]
+
+    def _candidates(self, apex, t_lo, t_hi):
+        """Unsorted positions of events with t in [t_lo, t_hi] inside the ball light can reach from apex."""
+        t = self.events[:, 0]
+        lo, hi = np.searchsorted(t, t_lo, side="left"), np.searchsorted(t, t_hi, side="right")
+        found = []
+        for b in range(lo // self.bucket_size, (hi - 1) // self.bucket_size + 1 if hi > lo else lo // self.bucket_size):
+            start = self.starts[b]
+            b_t = t[start:start + self.bucket_size]
+            reach = self.c * max(abs(min(b_t[-1], t_hi) - apex[0]), abs(max(b_t[0], t_lo) - apex[0]))
+            hits = np.asarray(self._tree(b).query_ball_point(apex[1:], reach * (1 + 1e-12)), dtype=np.int64)
+            found.append(hits + start)
+        pos = np.concatenate(found) if found else np.empty(0, dtype=np.int64)
+        return pos[(pos >= lo) & (pos < hi)]
+
+    def _apex(self, event):
+        if np.ndim(event) == 0:
+            if self._rank is None:
+                self._rank = np.empty_like(self.order)
+                self._rank[self.order] = np.arange(len(self.order))
+            return self.events[self._rank[event]]
+        return np.asarray(event, dtype=float)
+
+    def cone(self, event, direction="future", horizon=None, null_tol=DEFAULT_NULL_TOL, include_null=True):
+        """Original indices of events in the future or past light cone of `event`.
+
+        event is an original row index or a (t, x, y, z) point. horizon
+        bounds |Δt|; without it the whole log on that side is scanned.
+        Events on the cone (within null_tol) count unless include_null=False.
+        Returns (indices, labels, s²), in no particular order.
+        """
+        apex = self._apex(event)
+        t = self.events[:, 0]
+        span = horizon if horizon is not None else (t[-1] - apex[0] if direction == "future" else apex[0] - t[0])
+        span = max(span, 0.0)
+        t_lo, t_hi = (apex[0], apex[0] + span) if direction == "future" else (apex[0] - span, apex[0])
+        pos = self._candidates(apex, t_lo, t_hi)
+        d = self.events[pos] - apex
+        labels, s2 = classify_intervals(d[:, 0], np.einsum("ij,ij->i", d[:, 1:], d[:, 1:]), self.c, null_tol)
+        keep = (labels == TIMELIKE) | ((labels == LIGHTLIKE) & include_null)
+        keep &= (d[:, 0] > 0) if direction == "future" else (d[:, 0] < 0)
+        return self.order[pos[keep]], labels[keep], s2[keep]
+
+    def proper_time_window(self, event, tau_min, tau_max, direction="future", horizon=None):
+        """Events reachable from `event` with proper time τ = √(s²)/c in [tau_min, tau_max].
+
+        The hyperboloids τ = const run out along the light cone, so give a
+        horizon on |Δt| to keep the search bounded. Returns (indices, τ).
+        """
+        idx, _, s2 = self.cone(event, direction, horizon, include_null=tau_min <= 0)
+        tau = np.sqrt(np.maximum(s2, 0)) / self.c
+        keep = (tau >= tau_min) & (tau <= tau_max)
+        return idx[keep], tau[keep]
+
+
+@lru_cache(maxsize=2)
+def synthetic_log(n_events=1_000_000, duration=1.0, size=3e8, seed=0):
+    """Seeded random event log (t in [0, duration], positions in a cube of side `size`)."""
+    rng = np.random.default_rng(seed)
+    events = np.empty((n_events, 4))
+    events[:, 0] = rng.uniform(0, duration, n_events)
+    events[:, 1:] = rng.uniform(-size / 2, size / 2, (n_events, 3))
+    events.setflags(write=False)
+    return events
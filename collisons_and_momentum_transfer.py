@@ -1,7 +1,7 @@
 import streamlit as st
-import numpy as np
+from lorentz_kernel import gamma
 import matplotlib.pyplot as plt
-from scipy.optimize import fsolve
+from collision_solver import solve_collisions
 
 st.set_page_config(page_title="Relativistic Collision Simulator", layout="centered")
 st.title("🧨 Relativistic Collision Simulator")
@@ -40,9 +40,6 @@ with col2:
 
 mode = st.radio("Collision type:", ["Elastic", "Perfectly Inelastic"])
 
-def gamma(v):
-    return 1 / np.sqrt(1 - v**2)
-
 # ---------------- Pre-Collision ----------------
 g1, g2 = gamma(v1), gamma(v2)
 E1, E2 = g1 * m1, g2 * m2
@@ -50,34 +47,11 @@ p1, p2 = g1 * m1 * v1, g2 * m2 * v2
 E_total, p_total = E1 + E2, p1 + p2
 
 # ---------------- Collision ----------------
-if mode == "Perfectly Inelastic":
-    def equation(vf):
-        g = gamma(vf)
-        return g * (m1 + m2) * vf - p_total  # Use momentum conservation only
-
-    vf_guess = (v1 * m1 + v2 * m2) / (m1 + m2)
-    vf = float(fsolve(equation, vf_guess))
-    gf = gamma(vf)
-    v1f = v2f = vf
-    E1f = gf * (m1 + m2)
-    E2f = 0
-    p1f = gf * (m1 + m2) * vf
-    p2f = 0
-else:
-    def to_solutions(vars):
-        v1f, v2f = vars
-        g1f, g2f = gamma(v1f), gamma(v2f)
-        p1f = g1f * m1 * v1f
-        p2f = g2f * m2 * v2f
-        E1f = g1f * m1
-        E2f = g2f * m2
-        return [p1f + p2f - p_total, E1f + E2f - E_total]
-
-    guess = [v2, v1]  # reverse guess
-    v1f, v2f = fsolve(to_solutions, guess)
-    g1f, g2f = gamma(v1f), gamma(v2f)
-    E1f, E2f = g1f * m1, g2f * m2
-    p1f, p2f = g1f * m1 * v1f, g2f * m2 * v2f
+# Closed-form solution: CoM reflection (elastic) or invariant-mass merger (inelastic)
+result = solve_collisions(m1, v1, m2, v2, elastic=(mode == "Elastic"))
+v1f, v2f = float(result.v1f), float(result.v2f)
+E1f, E2f = float(result.E1f), float(result.E2f)
+p1f, p2f = float(result.p1f), float(result.p2f)
 
 # ---------------- Output Display ----------------
 st.subheader("📊 Results")
@@ -94,6 +68,8 @@ with col2:
     st.latex(rf"v_1' = {v1f:.4f}, \quad E_1' = {E1f:.4f}, \quad p_1' = {p1f:.4f}")
     st.latex(rf"v_2' = {v2f:.4f}, \quad E_2' = {E2f:.4f}, \quad p_2' = {p2f:.4f}")
     st.latex(rf"\Delta E = {E1f + E2f - E_total:+.4e}, \quad \Delta p = {p1f + p2f - p_total:+.4e}")
+    if mode == "Perfectly Inelastic":
+        st.latex(rf"M' = \sqrt{{E_{{\text{{total}}}}^2 - p_{{\text{{total}}}}^2}} = {float(result.m_final[..., 0]):.4f}")
 
 # ---------------- Conservation Check ----------------
 if abs((E1 + E2) - (E1f + E2f)) > 1e-5 or abs((p1 + p2) - (p1f + p2f)) > 1e-5:
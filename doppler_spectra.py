@@ -0,0 +1,154 @@
+import io
+
+import numpy as np
+
+from lorentz_kernel import lorentz_factors
+
+# Velocities are fractions of c, positive when the source recedes. θ is the
+# angle between the source velocity and the line of sight pointing away from
+# the observer, so θ = 0 is pure recession and θ = 90° is transverse motion.
+
+
+def doppler_factor(beta, theta=None):
+    """λ_obs / λ_emit for sources moving at beta; radial motion when theta is None.
+
+    Radial: D = √((1 + β)/(1 − β)) = e^η, taken from the rapidity so it stays
+    accurate near |β| = 1. Otherwise D = γ (1 + β cos θ), θ in radians.
+    """
+    f = lorentz_factors(beta)
+    if theta is None:
+        return np.exp(f.rapidity)
+    return f.gamma * (1 + np.asarray(beta, dtype=float) * np.cos(theta))
+
+
+def redshift_to_velocity(z, theta=None):
+    """Invert 1 + z = D for a catalogue of redshifts.
+
+    Radial (theta None): signed β = (k² − 1)/(k² + 1) with k = 1 + z,
+    written as z (2 + z)/(k² + 1) so small redshifts keep full precision.
+    With angles the result is the speed β ≥ 0 solving k = γ (1 + β cos θ);
+    where two speeds fit (approaching at cos θ < 0) the slower is returned,
+    and NaN where no speed does (e.g. z < 0 for transverse motion).
+    """
+    z = np.asarray(z, dtype=float)
+    k = 1 + z
+    k2_minus_1 = z * (2 + z)
+    if theta is None:
+        return k2_minus_1 / (k**2 + 1)
+    c = np.cos(theta)
+    # Squaring gives (k² + c²) β² + 2cβ + 1 − k² = 0, discriminant 4k²(k² + c² − 1).
+    a = k**2 + c**2
+    with np.errstate(invalid="ignore", divide="ignore"):
+        root = k * np.sqrt(k2_minus_1 + c**2)
+        # Larger-magnitude root directly, the other from the product (1 − k²)/a: no cancellation.
+        q = -(c + np.where(c < 0, -root, root))
+        r1, r2 = q / a, -k2_minus_1 / q
+    lo, hi = np.fmin(r1, r2), np.fmax(r1, r2)
+    # Only roots of the unsquared equation count: 0 ≤ β < 1 and 1 + βc > 0.
+    ok_lo = (lo >= 0) & (lo < 1) & (1 + lo * c > 0)
+    ok_hi = (hi >= 0) & (hi < 1) & (1 + hi * c > 0)
+    return np.where(ok_lo, lo, np.where(ok_hi, hi, np.nan))
+
+
+def spectrum_strip(wavelengths, intensity, cmap, lo=380.0, hi=750.0):
+    """(1, N, 4) RGBA row for imshow: hue from wavelength, alpha from intensity."""
+    rgba = cmap((np.asarray(wavelengths) - lo) / (hi - lo))
+    rgba[:, 3] = np.clip(intensity, 0, 1)
+    return rgba[None]
+
+
+def load_spectrum(source):
+    """Read a two-column spectrum (wavelength, flux) from a path or uploaded file.
+
+    .npy files given by path are memory-mapped; arrays of shape (2, N) or
+    (N, 2) are both accepted. CSV may have a header line. Returns
+    (wavelength, flux) as column views sorted by wavelength.
+    """
+    name = getattr(source, "name", str(source))
+    if hasattr(source, "seek"):
+        source.seek(0)  # uploads are re-read on a cache miss
+    if name.lower().endswith(".npy"):
+        data = np.load(source, mmap_mode="r") if isinstance(source, str) else np.load(source)
+    else:
+        if hasattr(source, "read"):
+            raw = source.read()
+        else:
+            with open(source, "rb") as fh:
+                raw = fh.read()
+        text = io.StringIO(raw.decode() if isinstance(raw, bytes) else raw)
+        first = text.readline()
+        skip = 0 if _is_numeric_row(first) else 1
+        text.seek(0)
+        data = np.loadtxt(text, delimiter=",", skiprows=skip, usecols=(0, 1), ndmin=2)
+    if data.ndim != 2 or 2 not in data.shape:
+        raise ValueError("Spectrum must have two columns: wavelength and flux.")
+    wl, flux = (data[0], data[1]) if data.shape[0] == 2 and data.shape[1] != 2 else (data[:, 0], data[:, 1])
+    if np.any(np.diff(wl) < 0):
+        order = np.argsort(wl, kind="stable")
+        wl, flux = wl[order], flux[order]
+    return wl, flux
+
+
+def load_redshifts(source):
+    """Read a redshift catalogue (z, optionally θ in degrees) from a CSV path or upload.
+
+    As for spectra, a header line is skipped; lines starting with # are
+    comments. Returns an (N, k) array with z in the first column.
+    """
+    if hasattr(source, "seek"):
+        source.seek(0)
+    if hasattr(source, "read"):
+        raw = source.read()
+    else:
+        with open(source, "rb") as fh:
+            raw = fh.read()
+    text = raw.decode() if isinstance(raw, bytes) else raw
+    lines = text.splitlines()
+    first = next((i for i, line in enumerate(lines) if line.strip() and not line.lstrip().startswith("#")), 0)
+    skip = first if first == len(lines) or _is_numeric_row(lines[first]) else first + 1
+    return np.loadtxt(io.StringIO(text), delimiter=",", skiprows=skip, ndmin=2, comments="#")
+
+
+def _is_numeric_row(line):
+    try:
+        [float(x) for x in line.split(",")[:2]]
+        return True
+    except ValueError:
+        return False
+
+
+def resample(wavelengths, flux, grid):
+    """Resample a sorted spectrum onto `grid` in one pass.
+
+    Each grid point takes the mean flux of the input samples in its cell
+    (cell edges halfway between grid points), so a 1e7-sample spectrum is
+    averaged rather than aliased. The outer cells are as wide as their
+    neighbours, and samples beyond them are dropped. Cells with no samples
+    fall back to linear interpolation.
+    """
+    grid = np.asarray(grid, dtype=float)
+    edges = np.concatenate([[grid[0] - (grid[1] - grid[0]) / 2], (grid[1:] + grid[:-1]) / 2,
+                            [grid[-1] + (grid[-1] - grid[-2]) / 2]])
+    idx = np.searchsorted(wavelengths, edges)
+    csum = np.concatenate([[0.0], np.cumsum(flux, dtype=float)])
+    counts = np.diff(idx)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = (csum[idx[1:]] - csum[idx[:-1]]) / counts
+    return np.where(counts > 0, mean, np.interp(grid, wavelengths, flux, left=0.0, right=0.0))
+
+
+def shift_spectrum(wavelengths, flux, beta, theta=None, grid=None, n_grid=4000):
+    """Doppler shift a spectrum and resample it onto an observed-wavelength grid.
+
+    The default grid spans the shifted wavelength range with n_grid points.
+    beta may be an array, giving one resampled row per velocity.
+    Returns (grid, observed flux).
+    """
+    wl = np.asarray(wavelengths, dtype=float)
+    D = np.atleast_1d(doppler_factor(beta, theta))
+    if grid is None:
+        grid = np.linspace(wl[0] * D.min(), wl[-1] * D.max(), n_grid)
+    # λ_obs = D λ_emit is monotonic, so shifting the grid back is equivalent
+    # to shifting every sample forward, and avoids an N-sized temporary.
+    rows = np.stack([resample(wl, flux, grid / d) for d in D])
+    return grid, rows[0] if np.ndim(beta) == 0 else rows
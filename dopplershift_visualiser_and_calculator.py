@@ -1,6 +1,8 @@
 import streamlit as st
 import numpy as np
 import matplotlib.pyplot as plt
+from doppler_spectra import (doppler_factor, load_redshifts, load_spectrum, redshift_to_velocity,
+                             shift_spectrum, spectrum_strip)
 
 # --- Setup ---
 st.set_page_config(page_title="Cosmic Doppler Shift Explorer", layout="centered")
@@ -55,9 +57,8 @@ wavelengths = np.linspace(380, 750, 1000)
 spectrum = np.exp(-0.5 * ((wavelengths - λ_obs)/10)**2)  # Gaussian at observed wavelength
 
 fig, ax = plt.subplots(figsize=(8, 1.5))
-for i in range(len(wavelengths) - 1):
-    color = plt.cm.hsv((wavelengths[i]-380)/370)
-    ax.axvspan(wavelengths[i], wavelengths[i+1], color=color, alpha=spectrum[i])
+ax.imshow(spectrum_strip(wavelengths, spectrum, plt.cm.hsv), extent=(380, 750, 0, 1),
+          aspect="auto", interpolation="nearest")
 
 ax.axvline(λ_obs, color='white', linestyle='--', label=f"λ_obs = {λ_obs:.1f} nm")
 ax.set_xlim(380, 750)
@@ -66,6 +67,82 @@ ax.set_xlabel("Wavelength (nm)")
 ax.set_title("Simulated Spectrum Shift")
 ax.legend()
 st.pyplot(fig)
+plt.close(fig)
+
+# --- Batch Spectrum Shift ---
+st.subheader("📂 Shift a Measured Spectrum")
+st.markdown("""
+Upload a spectrum as CSV or NPY with two columns, wavelength (nm) and flux, or give the path of a local `.npy`
+file to have it memory-mapped. The whole spectrum is Doppler shifted with the source speed from the sidebar and
+averaged onto an observed-wavelength grid in one vectorised pass.
+""")
+
+
+@st.cache_data(max_entries=2)
+def read_uploaded_spectrum(upload):
+    return load_spectrum(upload)
+
+
+spec_file = st.file_uploader("Spectrum file", type=["csv", "npy"])
+spec_path = st.text_input("…or path to a local .npy spectrum", "")
+spec_angle = st.slider("Angle between source velocity and line of sight (°)", 0, 180, 0,
+                       help="0° is pure recession, 180° pure approach.")
+n_grid = st.select_slider("Observed grid points", [1000, 2000, 4000, 8000], value=4000)
+
+if spec_file is not None or spec_path.strip():
+    try:
+        spec_wl, spec_flux = (read_uploaded_spectrum(spec_file) if spec_file is not None
+                              else load_spectrum(spec_path.strip()))
+    except (OSError, ValueError) as exc:
+        st.error(f"Could not read spectrum: {exc}")
+    else:
+        theta = None if spec_angle == 0 else np.radians(spec_angle)
+        grid, observed = shift_spectrum(spec_wl, spec_flux, v_frac, theta, n_grid=n_grid)
+        rest_grid, rest = shift_spectrum(spec_wl, spec_flux, 0.0, n_grid=n_grid)
+        fig, ax = plt.subplots(figsize=(8, 3))
+        ax.plot(rest_grid, rest, color="gray", lw=1, label="Emitted")
+        ax.plot(grid, observed, color="crimson", lw=1, label="Observed")
+        ax.set_xlabel("Wavelength (nm)")
+        ax.set_ylabel("Flux")
+        ax.legend()
+        st.pyplot(fig)
+        plt.close(fig)
+        D = float(doppler_factor(v_frac, theta))
+        st.caption(f"{len(spec_wl):,} samples shifted by λ_obs/λ_emit = {D:.5f} and averaged onto {n_grid} points.")
+        # The CSV is only built when the button is clicked, not on every rerun.
+        st.download_button("Download observed spectrum (CSV)",
+                           lambda: "\n".join(f"{a:.6f},{b:.6e}" for a, b in zip(grid, observed)),
+                           file_name="observed_spectrum.csv", on_click="ignore")
+
+# --- Redshift Catalogue ---
+st.subheader("🗂️ Redshifts to Velocities")
+st.markdown("""
+Upload a CSV of redshifts (first column $z$, optional second column: angle θ in degrees between the velocity
+and the line of sight). Without angles the radial formula gives a signed velocity; with them the speed solves
+""")
+st.latex(r"1 + z = \gamma \left(1 + \beta \cos\theta\right)")
+
+z_file = st.file_uploader("Redshift catalogue (CSV)", type=["csv"])
+if z_file is not None:
+    try:
+        z_data = load_redshifts(z_file)
+    except ValueError as exc:
+        st.error(f"Could not read catalogue: {exc}")
+    else:
+        z_vals = z_data[:, 0]
+        angles = np.radians(z_data[:, 1]) if z_data.shape[1] > 1 else None
+        betas = redshift_to_velocity(z_vals, angles)
+        fig, ax = plt.subplots(figsize=(8, 3))
+        ax.hist(betas[np.isfinite(betas)], bins=100, color="steelblue")
+        ax.set_xlabel("β = v/c")
+        ax.set_ylabel("Count")
+        st.pyplot(fig)
+        plt.close(fig)
+        n_bad = int(np.sum(~np.isfinite(betas)))
+        st.caption(f"{len(z_vals):,} redshifts converted" + (f"; {n_bad:,} have no physical solution." if n_bad else "."))
+        st.download_button("Download velocities (CSV)",
+                           lambda: "\n".join(f"{z:.8g},{b:.10g}" for z, b in zip(z_vals, betas)),
+                           file_name="velocities.csv", on_click="ignore")
 
 # --- Info Box ---
 st.markdown("### 📚 Explanation")
@@ -1,5 +1,9 @@
 import streamlit as st
 import numpy as np
+import time
+import matplotlib.pyplot as plt
+from lorentz_kernel import gamma as lorentz_gamma
+from phase_space import conserves, generate_chunks, on_shell
 
 # Streamlit page setup
 st.set_page_config(page_title="Energy-Momentum Relation", layout="centered")
@@ -14,7 +18,7 @@ mass = st.number_input("Enter rest mass \( m \):", min_value=0.0, value=1.0, ste
 velocity = st.number_input("Enter velocity \( v \) (as a fraction of \( c \)):", min_value=0.0, max_value=0.999999, value=0.6, step=0.01, format="%.6f")
 
 # Lorentz factor
-gamma = 1 / np.sqrt(1 - velocity**2)
+gamma = lorentz_gamma(velocity)
 
 # Compute momentum and energy
 p = gamma * mass * velocity       # p = γmv
@@ -43,6 +47,77 @@ else:
     st.error("❌ Relation does not hold. Check inputs.")
 
 
+# --- Bulk check on generated decays ---
+st.subheader("🎲 Bulk Check: Decay Events")
+st.markdown("""
+The same relation, checked for every particle of many generated decays. A parent of mass $M$ moving with momentum $p$
+decays into the listed daughters with phase-space (Raubold–Lynch) sampling; each event carries a weight proportional to
+its phase-space density. Events are generated and checked in chunks, so memory stays bounded at any count.
+""")
+dk1, dk2 = st.columns(2)
+with dk1:
+    parent_mass = st.number_input("Parent mass M", min_value=0.001, value=0.5479, step=0.01, format="%.4f")
+    parent_p = st.number_input("Parent momentum p (along z)", min_value=0.0, value=2.0, step=0.1)
+with dk2:
+    daughters_text = st.text_input("Daughter masses (comma-separated)", "0.1396, 0.1396, 0.1350")
+    n_decays = st.select_slider("Events", [10_000, 100_000, 1_000_000, 10_000_000], 100_000)
+
+
+@st.cache_data(max_entries=4)
+def decay_summary(M, p, masses, n_events, bins=60):
+    parent = np.array([np.hypot(M, p), 0.0, 0.0, p])
+    e_edges = np.linspace(masses[0], parent[0], bins + 1)
+    e_hist = np.zeros(bins)
+    s_lo, s_hi = (masses[0] + masses[1]) ** 2, (M - sum(masses[2:])) ** 2
+    dalitz = np.zeros((bins, bins))
+    n_ok = n_conserved = 0
+    t0 = time.perf_counter()
+    for events in generate_chunks(parent, masses, n_events):
+        p4, w = events.p4, events.weights
+        n_ok += int(on_shell(p4, masses).sum())
+        n_conserved += int(conserves(p4, parent).sum())
+        e_hist += np.histogram(p4[:, 0, 0], e_edges, weights=w)[0]
+        if len(masses) == 3:
+            pair_12, pair_23 = p4[:, 0] + p4[:, 1], p4[:, 1] + p4[:, 2]
+            s12 = pair_12[:, 0] ** 2 - np.einsum("ni,ni->n", pair_12[:, 1:], pair_12[:, 1:])
+            s23 = pair_23[:, 0] ** 2 - np.einsum("ni,ni->n", pair_23[:, 1:], pair_23[:, 1:])
+            s_lo23, s_hi23 = (masses[1] + masses[2]) ** 2, (M - masses[0]) ** 2
+            dalitz += np.histogram2d(s12, s23, bins, [[s_lo, s_hi], [s_lo23, s_hi23]], weights=w)[0]
+    return n_ok, n_conserved, n_events / (time.perf_counter() - t0), e_edges, e_hist, dalitz
+
+
+try:
+    daughter_masses = tuple(float(m) for m in daughters_text.split(",") if m.strip())
+    if len(daughter_masses) < 2 or min(daughter_masses) < 0:
+        raise ValueError("Give at least two non-negative masses.")
+    n_ok, n_conserved, rate, e_edges, e_hist, dalitz = decay_summary(parent_mass, parent_p, daughter_masses, n_decays)
+except ValueError as exc:
+    st.error(f"Cannot generate these decays: {exc}")
+else:
+    if n_ok == n_decays:
+        st.success(f"✔️ E² = p² + m² holds for every particle in all {n_decays:,} events.")
+    else:
+        st.error(f"❌ {n_decays - n_ok:,} of {n_decays:,} events fail the energy-momentum relation.")
+    st.caption(f"{n_conserved:,} of {n_decays:,} events conserve total four-momentum; "
+               f"{rate:,.0f} events/s including the checks.")
+    panels = 2 if len(daughter_masses) == 3 else 1
+    fig, axes = plt.subplots(1, panels, figsize=(5 * panels, 4), squeeze=False)
+    axes[0, 0].stairs(e_hist / e_hist.sum(), e_edges, fill=True, color="steelblue")
+    axes[0, 0].set_xlabel("Energy of daughter 1")
+    axes[0, 0].set_ylabel("Weighted fraction")
+    if panels == 2:
+        axes[0, 1].imshow(np.ma.masked_equal(dalitz.T, 0), origin="lower", aspect="auto", cmap="viridis",
+                          extent=((daughter_masses[0] + daughter_masses[1]) ** 2,
+                                  (parent_mass - daughter_masses[2]) ** 2,
+                                  (daughter_masses[1] + daughter_masses[2]) ** 2,
+                                  (parent_mass - daughter_masses[0]) ** 2))
+        axes[0, 1].set_xlabel("$m_{12}^2$")
+        axes[0, 1].set_ylabel("$m_{23}^2$")
+        axes[0, 1].set_title("Dalitz plot (flat for pure phase space)")
+    fig.tight_layout()
+    st.pyplot(fig)
+    plt.close(fig)
+
 st.markdown("""
 <hr style='margin-top: 50px; margin-bottom: 10px'>
 
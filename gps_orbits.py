@@ -0,0 +1,137 @@
+import numpy as np
+
+# --- Constants (SI) ---
+c = 299_792_458.0        # speed of light (m/s)
+GM = 3.986004418e14      # Earth's gravitational parameter (m³/s²)
+L_G = 6.969290134e-10    # geoid potential / c²: rate of a ground clock vs. the far-field clock
+omega_earth = 7.2921151467e-5  # Earth rotation rate (rad/s)
+a_gps = 26_559_700.0     # nominal GPS semi-major axis (m)
+
+
+def nominal_constellation(n_sats=31, max_ecc=0.02, seed=0):
+    """Keplerian elements for a GPS-like constellation: six 55° planes, slots spread evenly.
+
+    Returns a dict of arrays (a, e, i, raan, argp, M0), angles in radians.
+    Small eccentricities are drawn from a seeded generator, as in the real fleet.
+    """
+    rng = np.random.default_rng(seed)
+    plane = np.arange(n_sats) % 6
+    slot = np.arange(n_sats) // 6
+    per_plane = np.bincount(plane, minlength=6)[plane]
+    return {
+        "a": np.full(n_sats, a_gps),
+        "e": rng.uniform(0.0, max_ecc, n_sats),
+        "i": np.full(n_sats, np.radians(55.0)),
+        "raan": np.radians(60.0 * plane),
+        "argp": rng.uniform(0, 2 * np.pi, n_sats),
+        "M0": 2 * np.pi * slot / per_plane + np.radians(15.0 * plane),
+    }
+
+
+def eccentric_anomaly(M, e, tol=1e-14, max_iter=10):
+    """Solve Kepler's equation E − e sin E = M by Newton's method, vectorised.
+
+    Stops once every element's correction is below tol; for GPS
+    eccentricities that takes two or three steps.
+    """
+    E = M + e * np.sin(M)
+    for _ in range(max_iter):
+        step = (E - e * np.sin(E) - M) / (1 - e * np.cos(E))
+        E -= step
+        if np.max(np.abs(step)) < tol:
+            break
+    return E
+
+
+def _mean_anomaly(elements, t):
+    # t is (K,) shared by every satellite, or (n_sats, K) with each satellite's own times.
+    n = np.sqrt(GM / elements["a"]**3)
+    t = t if t.ndim == 2 else t[None, :]
+    return np.mod(elements["M0"][:, None] + n[:, None] * t, 2 * np.pi)
+
+
+def orbit_radius(elements, t):
+    """Geocentric distance (m) of each satellite at times t (s); shape (n_sats, len(t))."""
+    E = eccentric_anomaly(_mean_anomaly(elements, t), elements["e"][:, None])
+    return elements["a"][:, None] * (1 - elements["e"][:, None] * np.cos(E))
+
+
+def eci_positions(elements, t):
+    """Earth-centred inertial positions (m); shape (n_sats, len(t), 3)."""
+    e = elements["e"][:, None]
+    a = elements["a"][:, None]
+    E = eccentric_anomaly(_mean_anomaly(elements, t), e)
+    x_orb = a * (np.cos(E) - e)
+    y_orb = a * np.sqrt(1 - e**2) * np.sin(E)
+
+    cO, sO = np.cos(elements["raan"])[:, None], np.sin(elements["raan"])[:, None]
+    cw, sw = np.cos(elements["argp"])[:, None], np.sin(elements["argp"])[:, None]
+    ci, si = np.cos(elements["i"])[:, None], np.sin(elements["i"])[:, None]
+    x = (cO * cw - sO * sw * ci) * x_orb + (-cO * sw - sO * cw * ci) * y_orb
+    y = (sO * cw + cO * sw * ci) * x_orb + (-sO * sw + cO * cw * ci) * y_orb
+    z = (sw * si) * x_orb + (cw * si) * y_orb
+    return np.stack([x, y, z], axis=-1)
+
+
+def clock_rate_offset(elements, r):
+    """Fractional rate of each satellite clock relative to a ground clock on the geoid.
+
+    dτ/dt − 1 = L_G − GM/(r c²) − v²/(2c²), and vis-viva gives
+    v² = GM (2/r − 1/a), so the rate depends on r alone.
+    """
+    a = elements["a"][:, None]
+    return L_G - 2 * GM / (r * c**2) + GM / (2 * a * c**2)
+
+
+def _neumaier_add(total, comp, values):
+    """Compensated (Neumaier) accumulation of `values` into `total`, in place."""
+    t = total + values
+    big = np.abs(total) >= np.abs(values)
+    comp += np.where(big, (total - t) + values, (values - t) + total)
+    total[...] = t
+
+
+def stream_drift(elements, t_end, dt=1.0, chunk_seconds=21_600.0):
+    """Integrate every satellite's clock offset from 0 to t_end seconds, chunk by chunk.
+
+    Each chunk evaluates the rate at the midpoint of every dt step, sums the
+    chunk pairwise, and folds it into a Neumaier-compensated running total,
+    so working memory is one (n_sats, chunk) block whatever the horizon.
+    Yields (t, drift_ns) after each chunk, drift_ns having shape (n_sats,).
+    """
+    n_sats = len(elements["a"])
+    total = np.zeros(n_sats)
+    comp = np.zeros(n_sats)
+    steps_per_chunk = max(1, int(round(chunk_seconds / dt)))
+    n_steps = int(round(t_end / dt))
+
+    for start in range(0, n_steps, steps_per_chunk):
+        stop = min(start + steps_per_chunk, n_steps)
+        t_mid = (np.arange(start, stop) + 0.5) * dt
+        rate = clock_rate_offset(elements, orbit_radius(elements, t_mid))
+        _neumaier_add(total, comp, rate.sum(axis=1) * dt)
+        yield stop * dt, (total + comp) * 1e9
+
+
+def total_drift(elements, t_end, dt=1.0, chunk_seconds=21_600.0):
+    """Accumulated clock offset (ns) of every satellite at t_end."""
+    drift = np.zeros(len(elements["a"]))
+    for _, drift in stream_drift(elements, t_end, dt, chunk_seconds):
+        pass
+    return drift
+
+
+def analytic_drift(elements, t):
+    """Closed-form offset (ns): secular rate plus the eccentricity term −2√(GMa) e sin E / c².
+
+    t is (K,) times shared by every satellite, or (n_sats, K) with each
+    satellite's own times; either way the result is (n_sats, K).
+    """
+    t = np.atleast_1d(np.asarray(t, dtype=float))
+    t = t if t.ndim == 2 else t[None, :]
+    a, e = elements["a"][:, None], elements["e"][:, None]
+    secular = L_G - 3 * GM / (2 * a * c**2)
+    E = eccentric_anomaly(_mean_anomaly(elements, t), e)
+    E0 = eccentric_anomaly(np.mod(elements["M0"], 2 * np.pi)[:, None], e)
+    periodic = -2 * np.sqrt(GM * a) * e * (np.sin(E) - np.sin(E0)) / c**2
+    return (secular * t + periodic) * 1e9
@@ -0,0 +1,132 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from gps_orbits import analytic_drift, eci_positions, nominal_constellation, omega_earth
+
+c = 299_792_458.0   # speed of light (m/s)
+R_earth = 6.371e6   # Earth radius (m)
+
+
+def receiver_grid(step_deg=1.0):
+    """Latitude/longitude grid (degrees) and ECEF receiver positions on a spherical Earth."""
+    lat = np.arange(-90.0, 90.0 + step_deg / 2, step_deg)
+    lon = np.arange(-180.0, 180.0, step_deg)
+    la, lo = np.radians(np.meshgrid(lat, lon, indexing="ij"))
+    xyz = R_earth * np.stack([np.cos(la) * np.cos(lo), np.cos(la) * np.sin(lo), np.sin(la)], axis=-1)
+    return lat, lon, xyz
+
+
+def ecef_satellites(elements, t):
+    """Satellite ECEF positions (m) at times t; shape (len(t), n_sats, 3)."""
+    eci = eci_positions(elements, np.atleast_1d(t)).transpose(1, 0, 2)
+    theta = omega_earth * np.atleast_1d(t)[:, None]
+    x = np.cos(theta) * eci[..., 0] + np.sin(theta) * eci[..., 1]
+    y = -np.sin(theta) * eci[..., 0] + np.cos(theta) * eci[..., 1]
+    return np.stack([x, y, eci[..., 2]], axis=-1)
+
+
+def uncorrected_clock_offsets(elements, t, sync_age_s):
+    """Satellite clock error (s) at times t if relativistic drift went uncorrected.
+
+    Each satellite was last synchronised sync_age_s seconds before t, so its
+    error is the drift accumulated over that window. Shape (len(t), n_sats).
+    """
+    t = np.atleast_1d(t)
+    sync = t[:, None] - np.asarray(sync_age_s)[None, :]
+    now = analytic_drift(elements, t).T
+    then = analytic_drift(elements, sync.T).T  # each satellite at its own sync times only
+    return (now - then) * 1e-9
+
+
+def solve_positions(receivers, sats, clock_offsets, estimate_clock_bias=True,
+                    elevation_mask_deg=10.0, iterations=3):
+    """Batched least-squares position fix for every receiver at one epoch.
+
+    receivers: (N, 3) true positions; sats: (n_sats, 3); clock_offsets: (n_sats,) s.
+    Pseudoranges are geometric ranges shortened by c·δt of each satellite clock.
+    All receivers are solved at once with masked normal equations; receivers
+    seeing fewer satellites than unknowns come back as NaN.
+
+    Returns (position_error (N, 3) m, clock_bias (N,) m, n_visible (N,)).
+    """
+    los = sats[None, :, :] - receivers[:, None, :]
+    dist = np.linalg.norm(los, axis=-1)
+    up = receivers / np.linalg.norm(receivers, axis=-1, keepdims=True)
+    visible = np.einsum("nsk,nk->ns", los, up) / dist > np.sin(np.radians(elevation_mask_deg))
+    W = visible.astype(float)
+    rho = dist - c * clock_offsets[None, :]
+
+    n_unknowns = 4 if estimate_clock_bias else 3
+    ok = visible.sum(axis=1) >= n_unknowns
+    x = np.concatenate([receivers, np.zeros((len(receivers), 1))], axis=1)
+    for _ in range(iterations):
+        los = sats[None, :, :] - x[:, None, :3]
+        rng = np.linalg.norm(los, axis=-1)
+        H = np.concatenate([-los / rng[..., None], np.ones_like(rng)[..., None]], axis=-1)[..., :n_unknowns]
+        resid = rho - (rng + x[:, 3:4])
+        N = np.einsum("nsi,ns,nsj->nij", H, W, H)
+        rhs = np.einsum("nsi,ns,ns->ni", H, W, resid)
+        N[~ok] = np.eye(n_unknowns)
+        x[:, :n_unknowns] += np.linalg.solve(N, rhs[..., None])[..., 0]
+
+    x[~ok] = np.nan
+    return x[:, :3] - receivers, x[:, 3], visible.sum(axis=1)
+
+
+def _solve_epoch(args):
+    receivers, sats, offsets, kwargs, chunk = args
+    errors, biases, counts = [], [], []
+    for start in range(0, len(receivers), chunk):
+        e, b, n = solve_positions(receivers[start:start + chunk], sats, offsets, **kwargs)
+        errors.append(np.linalg.norm(e, axis=-1))
+        biases.append(b)
+        counts.append(n)
+    return np.concatenate(errors), np.concatenate(biases), np.concatenate(counts)
+
+
+def error_map(epochs_s, step_deg=1.0, elements=None, sync_age_s=86_400.0,
+              workers=None, chunk=8192, seed=0, **solve_kwargs):
+    """Position error over a global receiver grid at each epoch.
+
+    sync_age_s may be a scalar or a (low, high) pair, in which case each
+    satellite's time since its last clock upload is drawn uniformly from
+    that range. Epochs are spread over a process pool; within an epoch the
+    grid is solved in vectorised chunks of `chunk` receivers.
+
+    Returns a dict with lat, lon, epochs and (n_epochs, n_lat, n_lon) maps of
+    3D position error (m), receiver clock bias (m) and visible satellites,
+    plus the naive range error c·δt averaged over satellites.
+    """
+    elements = elements or nominal_constellation()
+    n_sats = len(elements["a"])
+    if np.ndim(sync_age_s) == 0:
+        ages = np.full(n_sats, float(sync_age_s))
+    else:
+        ages = np.random.default_rng(seed).uniform(*sync_age_s, n_sats)
+
+    epochs = np.atleast_1d(np.asarray(epochs_s, dtype=float))
+    lat, lon, grid = receiver_grid(step_deg)
+    receivers = grid.reshape(-1, 3)
+    sats = ecef_satellites(elements, epochs)
+    offsets = uncorrected_clock_offsets(elements, epochs, ages)
+    tasks = [(receivers, sats[k], offsets[k], solve_kwargs, chunk) for k in range(len(epochs))]
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(epochs) == 1:
+        results = [_solve_epoch(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_solve_epoch, tasks))
+
+    shape = (len(epochs), len(lat), len(lon))
+    return {
+        "lat": lat,
+        "lon": lon,
+        "epochs_s": epochs,
+        "error_m": np.stack([r[0] for r in results]).reshape(shape),
+        "clock_bias_m": np.stack([r[1] for r in results]).reshape(shape),
+        "n_visible": np.stack([r[2] for r in results]).reshape(shape),
+        "range_error_m": c * np.abs(offsets).mean(axis=1),
+    }
@@ -1,7 +1,10 @@
 import streamlit as st
 import numpy as np
+from lorentz_kernel import gamma as lorentz_gamma
 import matplotlib.pyplot as plt
-import time
+import plotly.graph_objs as go
+from gps_orbits import nominal_constellation, stream_drift
+from gps_positioning import error_map
 
 # --- Setup ---
 st.set_page_config(page_title="GPS Time Correction Simulator", layout="centered")
@@ -14,6 +17,7 @@ This simulation shows how **Special Relativity (SR)** and **General Relativity (
 c = 3e8        # Speed of light (m/s)
 g = 9.81       # Gravity (m/s²)
 R_earth = 6.371e6  # Earth radius (m)
+MAX_SAT_STEPS = 2e8  # satellites × steps per run: roughly a minute of propagation
 
 # --- Input Section ---
 st.subheader("🔧 Satellite Parameters")
@@ -27,7 +31,7 @@ alt = alt_km * 1e3  # m
 v = v_kms * 1e3    # m/s
 
 # --- Time Dilation Calculations ---
-gamma = 1 / np.sqrt(1 - v**2 / c**2)
+gamma = lorentz_gamma(v / c)
 sr_drift = (1 - 1/gamma) * 86400       # seconds/day lost (SR)
 gr_drift = (g * alt / c**2) * 86400    # seconds/day gained (GR)
 net_drift_ns = (gr_drift - sr_drift) * 1e9  # ns/day
@@ -60,53 +64,149 @@ speed = st.slider("Animation Duration (seconds)", 1.0, 10.0, 4.0)
 days = np.linspace(0, 30, 300)
 drift_over_days_ns = net_drift_ns * days
 
-# --- Session State Initialization ---
-if "running" not in st.session_state:
-    st.session_state.running = False
-if "frame_idx" not in st.session_state:
-    st.session_state.frame_idx = 0
-
-# --- Control Buttons ---
-start, stop = st.columns(2)
-with start:
-    if st.button("▶️ Start Animation"):
-        st.session_state.running = True
-        st.session_state.frame_idx = 0
-with stop:
-    if st.button("⏹️ Stop Animation"):
-        st.session_state.running = False
-
-# --- Plot Area ---
-plot_area = st.empty()
-
-if st.session_state.running:
-    # Animate from current frame
-    for i in range(st.session_state.frame_idx, len(days)):
-        fig, ax = plt.subplots(figsize=(8, 4))
-        ax.plot(days[:i+1], drift_over_days_ns[:i+1], color='darkgreen')
-        ax.set_xlabel("Days")
-        ax.set_ylabel("Cumulative Drift (ns)")
-        ax.set_title("Net Time Difference: GPS vs Earth")
-        ax.grid(True)
-        plot_area.pyplot(fig)
-        time.sleep(speed / len(days))
-        st.session_state.frame_idx += 1
-        if not st.session_state.running:
-            break
-
-    # If reached end, stop
-    if st.session_state.frame_idx >= len(days):
-        st.session_state.running = False
-        st.success("✅ Animation complete. Press ▶️ to replay.")
-else:
-    # Static full plot
+# --- Client-Side Animation ---
+# All frames are built in one pass and played back by Plotly in the browser,
+# so the server sends one figure instead of a PNG per frame.
+n_frames = 100
+frame_ends = np.linspace(1, len(days), n_frames).astype(int)
+frame_ms = 1000 * speed / n_frames
+
+fig = go.Figure(
+    data=[
+        go.Scatter(x=days, y=drift_over_days_ns, mode="lines",
+                   line=dict(color="darkgreen", width=2), name="Cumulative drift"),
+        go.Scatter(x=days[-1:], y=drift_over_days_ns[-1:], mode="markers",
+                   marker=dict(color="darkgreen", size=8), showlegend=False),
+    ],
+    frames=[
+        go.Frame(data=[
+            go.Scatter(x=days[:k], y=drift_over_days_ns[:k]),
+            go.Scatter(x=days[k - 1:k], y=drift_over_days_ns[k - 1:k]),
+        ], name=str(k))
+        for k in frame_ends
+    ],
+)
+y_lo, y_hi = sorted([0.0, drift_over_days_ns[-1]])
+pad = 0.05 * (y_hi - y_lo or 1.0)
+fig.update_layout(
+    title="Net Time Difference: GPS vs Earth",
+    xaxis=dict(title="Days", range=[0, days[-1]]),
+    yaxis=dict(title="Cumulative Drift (ns)", range=[y_lo - pad, y_hi + pad]),
+    height=400,
+    updatemenus=[dict(
+        type="buttons", direction="left", x=0.0, y=1.15, xanchor="left",
+        buttons=[
+            dict(label="▶️ Start Animation", method="animate",
+                 args=[None, dict(frame=dict(duration=frame_ms, redraw=False),
+                                  transition=dict(duration=0), fromcurrent=False, mode="immediate")]),
+            dict(label="⏹️ Stop Animation", method="animate",
+                 args=[[None], dict(frame=dict(duration=0, redraw=False), mode="immediate")]),
+        ],
+    )],
+)
+st.plotly_chart(fig, use_container_width=True)
+
+# --- Full Constellation ---
+st.subheader("🌐 Full Constellation Over Long Horizons")
+st.markdown("""
+The figures above use a flat-gravity estimate for one circular orbit. Here every satellite of a
+GPS-like constellation follows its own Keplerian (slightly eccentric) orbit, and the clock rate uses the
+full potential $GM/r$ plus the orbital speed, integrated step by step with compensated summation.
+""")
+st.latex(r"\frac{d\tau}{dt} - 1 = L_G - \frac{GM}{r c^2} - \frac{v^2}{2c^2}")
+
+cons_col1, cons_col2, cons_col3 = st.columns(3)
+with cons_col1:
+    n_sats = st.number_input("Satellites", min_value=1, max_value=64, value=31)
+with cons_col2:
+    horizon_years = st.slider("Horizon (years)", 0.1, 10.0, 1.0, step=0.1)
+t_end = horizon_years * 365.25 * 86400
+# Finer steps are only offered while the run stays within the budget; 600 s always fits.
+step_options = [s for s in [1, 10, 60, 600] if n_sats * t_end / s <= MAX_SAT_STEPS]
+with cons_col3:
+    step_s = st.selectbox("Time step (s)", step_options, index=step_options.index(60) if 60 in step_options else 0)
+if len(step_options) < 4:
+    st.caption("Finer time steps are hidden for this horizon and constellation size to keep the run near a minute.")
+
+if st.button("🛰️ Propagate Constellation"):
+    elements = nominal_constellation(int(n_sats))
+    # About 200 plot points, but never more than 21,600 steps per chunk, so memory stays flat at any horizon.
+    chunk_seconds = min(max(step_s, round(t_end / 200 / step_s) * step_s), 21_600 * step_s)
+    progress = st.progress(0.0)
+    shown = 0.0
+    t_points, drift_points = [0.0], [np.zeros(int(n_sats))]
+    for t_done, drift_ns in stream_drift(elements, t_end, dt=step_s, chunk_seconds=chunk_seconds):
+        t_points.append(t_done)
+        drift_points.append(drift_ns)
+        if t_done / t_end - shown >= 0.005 or t_done >= t_end:
+            shown = min(t_done / t_end, 1.0)
+            progress.progress(shown)
+    t_days = np.array(t_points) / 86400
+    drift_us = np.array(drift_points) / 1e3
+
     fig, ax = plt.subplots(figsize=(8, 4))
-    ax.plot(days, drift_over_days_ns, color='darkgreen')
+    ax.plot(t_days, drift_us, color='darkgreen', linewidth=0.6, alpha=0.6)
     ax.set_xlabel("Days")
-    ax.set_ylabel("Cumulative Drift (ns)")
-    ax.set_title("Net Time Difference: GPS vs Earth")
+    ax.set_ylabel("Cumulative Drift (μs)")
+    ax.set_title(f"Clock Offset of {int(n_sats)} Satellites vs Ground")
     ax.grid(True)
-    plot_area.pyplot(fig)
+    st.pyplot(fig)
+    plt.close(fig)
+
+    final = drift_points[-1]
+    st.metric("Mean Drift Rate (full potential)", f"{final.mean() / (t_end / 86400):.2f} ns/day")
+    st.caption(f"Spread across satellites at the horizon: {final.max() - final.min():.3f} ns "
+               "(from the eccentricity term).")
+
+# --- Positioning Error Map ---
+st.subheader("🗺️ Positioning Error Across the Globe")
+st.markdown("""
+Uncorrected satellite clocks turn into pseudorange errors of $c\\,\\delta t$. Every receiver on a
+latitude/longitude grid solves for its position from the satellites above a 10° elevation mask, at
+several epochs through the day.
+""")
+
+map_col1, map_col2, map_col3 = st.columns(3)
+with map_col1:
+    grid_step = st.selectbox("Grid spacing (°)", [1.0, 2.0, 5.0], index=0)
+with map_col2:
+    n_epochs = st.slider("Epochs (hourly)", 1, 24, 6)
+with map_col3:
+    uncorrected_days = st.slider("Days without correction", 0.1, 7.0, 1.0, step=0.1)
+random_sync = st.checkbox("Satellites last synchronised at different times", value=True)
+estimate_bias = st.checkbox("Receiver estimates its own clock bias", value=True)
+
+
+@st.cache_data(max_entries=8, show_spinner="Solving positions for every grid point and epoch…")
+def cached_error_map(n_epochs, grid_step, uncorrected_days, random_sync, estimate_bias):
+    age = uncorrected_days * 86400
+    return error_map(np.arange(n_epochs) * 3600.0, step_deg=grid_step,
+                     sync_age_s=(0.0, age) if random_sync else age,
+                     estimate_clock_bias=estimate_bias)
+
+
+if st.button("🧭 Compute Error Map"):
+    st.session_state.error_map_args = (n_epochs, grid_step, uncorrected_days, random_sync, estimate_bias)
+
+if "error_map_args" in st.session_state:
+    emap = cached_error_map(*st.session_state.error_map_args)
+    epoch_idx = st.slider("Epoch (hour)", 0, len(emap["epochs_s"]) - 1, 0) if len(emap["epochs_s"]) > 1 else 0
+    err_km = emap["error_m"][epoch_idx] / 1e3
+
+    fig, ax = plt.subplots(figsize=(9, 4.5))
+    im = ax.imshow(err_km, origin="lower", aspect="auto", cmap="magma",
+                   extent=[emap["lon"][0], emap["lon"][-1], emap["lat"][0], emap["lat"][-1]])
+    fig.colorbar(im, ax=ax, label="Position error (km)")
+    ax.set_xlabel("Longitude (°)")
+    ax.set_ylabel("Latitude (°)")
+    ax.set_title(f"3D Position Error at t = {emap['epochs_s'][epoch_idx] / 3600:.0f} h")
+    st.pyplot(fig)
+    plt.close(fig)
+
+    c1, c2, c3 = st.columns(3)
+    c1.metric("Mean range error c·δt", f"{emap['range_error_m'][epoch_idx] / 1e3:.2f} km")
+    c2.metric("Median position error", f"{np.nanmedian(err_km):.3f} km")
+    c3.metric("Worst position error", f"{np.nanmax(err_km):.3f} km")
 
 # --- Explanation ---
 st.markdown("### 📚 Why This Matters")
@@ -0,0 +1,147 @@
+import os
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from worldlines import HyperbolicWorldline
+
+# Units are years and light-years, so c = 1 and Earth gravity is
+# G_LY_YR2 ≈ 1.03 ly/yr². A round trip to a star at distance D has an
+# outbound and a return leg; each leg accelerates at proper acceleration a
+# up to peak rapidity η, coasts, and brakes back to rest at a.
+# A burn that changes rapidity by Δη costs a mass ratio exp(Δη / w) for
+# exhaust speed w (the relativistic rocket equation), so the whole trip
+# needs exp((2η_out + 2η_back) / w).
+
+G_LY_YR2 = 9.80665 * (365.25 * 86400) ** 2 / 9.4607304725808e15
+
+TripMetrics = namedtuple("TripMetrics", ["earth_time", "proper_time", "mass_ratio", "peak_speed"])
+Itinerary = namedtuple("Itinerary", ["accel", "durations", "metrics", "params"])
+
+
+def _leg(a, u, distance):
+    """Coordinate and proper time of one leg; u ∈ (0, 1] scales the largest η that fits in `distance`."""
+    eta = u * np.arccosh(1 + a * distance / 2)
+    burn_t = np.sinh(eta) / a
+    burn_x = (np.cosh(eta) - 1) / a
+    speed = np.tanh(eta)
+    coast_t = np.maximum(distance - 2 * burn_x, 0.0) / speed
+    return eta, burn_t, coast_t, 2 * burn_t + coast_t, 2 * eta / a + coast_t / np.cosh(eta)
+
+
+def evaluate(params, distance, exhaust_speed):
+    """TripMetrics for a batch of itineraries, vectorised.
+
+    params is (N, 4): outbound proper acceleration, outbound η fraction,
+    return proper acceleration, return η fraction. Accelerations are in
+    ly/yr²; an η fraction of 1 means the leg is all burn and no coast.
+    """
+    params = np.asarray(params, dtype=float)
+    eta_o, _, _, t_o, tau_o = _leg(params[:, 0], params[:, 1], distance)
+    eta_b, _, _, t_b, tau_b = _leg(params[:, 2], params[:, 3], distance)
+    return TripMetrics(t_o + t_b, tau_o + tau_b, np.exp(2 * (eta_o + eta_b) / exhaust_speed),
+                       np.tanh(np.maximum(eta_o, eta_b)))
+
+
+def _score(metrics, objective, max_mass_ratio, max_proper_time):
+    """Objective to minimise, with constraint violations pushed above every feasible score."""
+    if objective == "proper_time":
+        value = metrics.proper_time
+        violation = np.log(metrics.mass_ratio) - np.log(max_mass_ratio)
+    else:
+        value = np.log(metrics.mass_ratio)
+        violation = metrics.proper_time - max_proper_time
+    return np.where(violation <= 0, value, 1e6 + violation)
+
+
+def _search(args):
+    """One cross-entropy search: sample a batch, keep the best tenth, refit, repeat."""
+    distance, exhaust_speed, a_min, a_max, objective, max_mass_ratio, max_proper_time, batch, rounds, seed = args
+    rng = np.random.default_rng(seed)
+    lo = np.array([a_min, 1e-6, a_min, 1e-6])
+    hi = np.array([a_max, 1.0, a_max, 1.0])
+    mean, std = rng.uniform(lo, hi), (hi - lo) / 2
+    best, best_score = None, np.inf
+    for _ in range(rounds):
+        params = np.clip(rng.normal(mean, std, (batch, 4)), lo, hi)
+        score = _score(evaluate(params, distance, exhaust_speed), objective, max_mass_ratio, max_proper_time)
+        elite = params[np.argsort(score)[:max(batch // 10, 2)]]
+        if score.min() < best_score:
+            best_score, best = float(score.min()), params[np.argmin(score)]
+        mean, std = elite.mean(axis=0), elite.std(axis=0) + 1e-9 * (hi - lo)
+    return best_score, best
+
+
+def itinerary(params, distance, exhaust_speed):
+    """Legs of the trip for HyperbolicWorldline: accelerations (ly/yr²) and coordinate durations (yr)."""
+    params = np.asarray(params, dtype=float)
+    _, burn_o, coast_o, _, _ = _leg(params[0], params[1], distance)
+    _, burn_b, coast_b, _, _ = _leg(params[2], params[3], distance)
+    accel = np.array([params[0], 0.0, -params[0], -params[2], 0.0, params[2]])
+    durations = np.array([burn_o, coast_o, burn_o, burn_b, coast_b, burn_b])
+    metrics = TripMetrics(*(float(m[0]) for m in evaluate(params[None], distance, exhaust_speed)))
+    return Itinerary(accel, durations, metrics, params)
+
+
+def optimize(distance, exhaust_speed=1.0, max_accel=1.0 * G_LY_YR2, min_accel=0.01 * G_LY_YR2,
+             objective="proper_time", max_mass_ratio=1e3, max_proper_time=np.inf,
+             batch=4096, rounds=25, restarts=None, workers=None, seed=0):
+    """Best round-trip itinerary to a star `distance` light-years away.
+
+    objective="proper_time" minimises the traveller's proper time within the
+    fuel budget max_mass_ratio; objective="fuel" minimises the mass ratio
+    with the traveller's proper time at most max_proper_time. Independent
+    cross-entropy searches, each evaluating batches of candidates at once,
+    run across a process pool; the best wins. Raises ValueError if no
+    candidate meets the constraint.
+    """
+    workers = workers or os.cpu_count() or 1
+    restarts = restarts or max(workers, 4)
+    jobs = [(distance, exhaust_speed, min_accel, max_accel, objective, max_mass_ratio, max_proper_time,
+             batch, rounds, seed + k) for k in range(restarts)]
+    if workers == 1:
+        results = [_search(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_search, jobs))
+    score, params = min(results, key=lambda r: r[0])
+    if score >= 1e6:
+        raise ValueError("No itinerary meets the constraint; raise the fuel budget or the time limit.")
+    return itinerary(params, distance, exhaust_speed)
+
+
+def worldline(itin):
+    """The itinerary as a HyperbolicWorldline, ready to sample x(t) and τ(t)."""
+    return HyperbolicWorldline(itin.accel, itin.durations)
+
+
+def benchmark(distance=4.37, seed=0):
+    """Optimise a round trip to Alpha Centauri both ways and time the batch evaluation."""
+    rng = np.random.default_rng(seed)
+    params = np.column_stack([rng.uniform(0.1, 1, 1_000_000), rng.uniform(0, 1, 1_000_000),
+                              rng.uniform(0.1, 1, 1_000_000), rng.uniform(0, 1, 1_000_000)])
+    t0 = time.perf_counter()
+    evaluate(params, distance, 1.0)
+    eval_s = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    fast = optimize(distance, max_mass_ratio=100.0)
+    optimize_s = time.perf_counter() - t0
+    cheap = optimize(distance, objective="fuel", max_proper_time=8.0)
+    path = worldline(fast)
+    return {
+        "candidates_per_s": len(params) / eval_s,
+        "optimize_s": optimize_s,
+        "fastest_tau_yr": fast.metrics.proper_time,
+        "fastest_mass_ratio": fast.metrics.mass_ratio,
+        "cheapest_mass_ratio": cheap.metrics.mass_ratio,
+        "cheapest_tau_yr": cheap.metrics.proper_time,
+        "worldline_tau_error": abs(float(path.tau_end) - fast.metrics.proper_time),
+        "worldline_return_x": abs(float(path.x_end)),
+    }
+
+
+if __name__ == "__main__":
+    for key, value in benchmark().items():
+        print(f"{key:>20}: {value:.4g}")
@@ -1,10 +1,10 @@
 import streamlit as st
-from PIL import Image
 import numpy as np
+from PIL import Image
 from mpmath import mp
-
-# High precision for near-c speeds
-mp.dps = 100
+from image_pipeline import ImageSource, contract, display_image, sweep_frames, to_gif
+from lorentz_kernel import lorentz_factors, lorentz_factors_mp, parse_speed
+from terrell_renderer import beta_sweep, render_extruded
 
 # Streamlit config
 st.set_page_config(page_title="Length Contraction Simulator", layout="centered")
@@ -30,18 +30,28 @@ st.subheader("Choose an Image")
 preset = st.checkbox("Use preset spaceship image")
 uploaded_file = st.file_uploader("Or upload your own image (PNG/JPG)", type=["png", "jpg", "jpeg"])
 
-# Load image
+
+@st.cache_resource
+def preset_source(path):
+    return ImageSource.from_path(path)
+
+
+# Load image (only the header here; pixels are decoded at display size and cached by content hash)
 if preset:
     try:
         preset_path = "images/spaceship.png"
-        image = Image.open(preset_path).convert("RGBA")
+        source = preset_source(preset_path)
         st.success("Using preset spaceship image.")
     except FileNotFoundError:
         st.error("Missing file: 'images/spaceship.png'. Please place it in the 'images/' folder.")
         st.stop()
 
 elif uploaded_file:
-    image = Image.open(uploaded_file).convert("RGBA")
+    try:
+        source = ImageSource(uploaded_file.getvalue(), uploaded_file.name)
+    except OSError:
+        st.error("Could not read the uploaded image.")
+        st.stop()
     st.success("Using uploaded image.")
 else:
     st.warning("Please select a preset or upload an image.")
@@ -49,30 +59,33 @@ else:
 
 # Velocity validation
 try:
-    v = mp.mpf(v_input.strip())
-    if v <= 0 or v >= 1:
+    v, one_minus_v = parse_speed(v_input)
+    if v <= 0:
         raise ValueError
 except:
     st.error("Invalid velocity. Must be a number strictly between 0 and 1.")
     st.stop()
 
 # Lorentz contraction calculations
-gamma = 1/mp.sqrt(1 - v**2)
-contracted_fraction = 1/gamma
-contraction_percent = (1 - contracted_fraction)*100
+factors = lorentz_factors(v, one_minus_v)
+gamma = lorentz_factors_mp(v_input, digits=20).gamma  # display only
+contracted_fraction = factors.inv_gamma
+contraction_percent = factors.gamma_minus_one * factors.inv_gamma * 100  # 1 − 1/γ without cancellation
 
-# Resize image horizontally only
-orig_w, orig_h = image.size
+# Resize image horizontally only, at display resolution
+orig_w, orig_h = source.size
 new_w = int(orig_w * float(contracted_fraction))
-contracted_image = image.resize((new_w, orig_h), Image.BICUBIC)
-# Display results (vertical stack)
-st.subheader("Results")
 
 # Cap the original width for layout purposes
 max_orig_width = 600
 scale = min(max_orig_width / orig_w, 1.0)
 disp_orig_w = int(orig_w * scale)
-disp_new_w  = int(new_w  * scale)
+disp_new_w  = max(1, int(new_w  * scale))
+
+image = display_image(source, disp_orig_w)
+contracted_image = contract(image, float(contracted_fraction))
+# Display results (vertical stack)
+st.subheader("Results")
 
 # Original image
 st.image(
@@ -106,6 +119,64 @@ st.markdown(f"""
 - **Direction**: Horizontal only (length parallel to motion)
 """)
 
+# Velocity sweep animation
+st.subheader("🎞️ Velocity Sweep")
+st.markdown("Watch the image contract as the speed ramps up from rest. Frames are resized in parallel worker processes.")
+sweep_col1, sweep_col2 = st.columns(2)
+with sweep_col1:
+    v_max = st.slider("Final speed (fraction of c)", 0.1, 0.999, 0.99, 0.001, format="%.3f")
+with sweep_col2:
+    n_frames = st.slider("Frames", 10, 120, 40)
+
+
+@st.cache_data(max_entries=4)
+def sweep_gif(_source, key, width, v_max, n_frames):
+    velocities = np.linspace(0.0, v_max, n_frames)
+    fractions = lorentz_factors(velocities).inv_gamma
+    frames = sweep_frames(display_image(_source, width), fractions)
+    return to_gif(frames + frames[-2:0:-1])  # play forwards, then back to rest
+
+
+if st.button("Generate sweep animation"):
+    with st.spinner("Contracting frames…"):
+        gif = sweep_gif(source, source.key, disp_orig_w, v_max, n_frames)
+    st.image(gif, caption=f"v from 0 to {v_max:.3f}c", width=disp_orig_w)
+
+
+# Terrell–Penrose appearance
+st.subheader("👁️ What a Camera Actually Sees")
+st.markdown("""
+The contraction above is what a *simultaneous measurement* gives. A photograph is different: light from the far
+parts of the object left earlier than light from the near parts, so the moving object appears **rotated**
+rather than squashed (the Terrell–Penrose effect). Here the image is extruded into a slab, and for every camera
+pixel the emission time is solved for exactly before the slab is sampled there.
+""")
+tp_col1, tp_col2 = st.columns(2)
+with tp_col1:
+    tp_beta = st.slider("Speed β", 0.0, 0.99, 0.9, 0.01, key="tp_beta")
+    tp_offset = st.slider("Apparent position along the motion", -1.5, 1.5, 0.0, 0.1)
+with tp_col2:
+    tp_depth = st.slider("Slab depth (fraction of width)", 0.1, 1.0, 0.5, 0.05)
+    tp_size = st.select_slider("Render size (px)", [256, 512, 1024], value=512)
+
+camera_distance = 4.0
+texture = np.asarray(display_image(source, min(256, orig_w)).convert("RGB"))
+# Light from the centre of view left about camera_distance earlier, when the object was β·distance behind.
+snapshot, _ = render_extruded(texture, tp_beta, shape=(tp_size, tp_size), depth=tp_depth,
+                              camera=(0.0, 0.0, camera_distance), x0=tp_offset, light_delay=False)
+photo, _ = render_extruded(texture, tp_beta, shape=(tp_size, tp_size), depth=tp_depth,
+                           camera=(0.0, 0.0, camera_distance), x0=tp_offset + tp_beta * camera_distance)
+tp_left, tp_right = st.columns(2)
+tp_left.image(snapshot, caption="Contracted (simultaneous measurement)", use_container_width=True)
+tp_right.image(photo, caption="Photographed (light-travel time included)", use_container_width=True)
+
+if st.button("Generate β sweep"):
+    with st.spinner("Rendering frames…"):
+        frames = [Image.fromarray((255 * img).astype(np.uint8)).convert("RGBA")
+                  for _, img in beta_sweep(texture, np.linspace(0.0, 0.99, 30), offset=tp_offset,
+                                           camera=(0.0, 0.0, camera_distance), shape=(256, 256),
+                                           depth=tp_depth)]
+    st.image(to_gif(frames + frames[-2:0:-1], duration_ms=80), caption="β from 0 to 0.99")
 
 st.markdown("""
 <hr style='margin-top: 50px; margin-bottom: 10px'>
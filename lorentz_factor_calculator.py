@@ -2,9 +2,7 @@ import streamlit as st
 import numpy as np
 import plotly.graph_objs as go
 from mpmath import mp
-
-# Set decimal precision (100 digits)
-mp.dps = 100
+from lorentz_kernel import lorentz_factors, lorentz_factors_mp
 
 # -----------------------------
 # Streamlit Page Config
@@ -22,27 +20,24 @@ st.subheader("🧮 Lorentz Factor Calculator (High Precision)")
 v_input = st.text_input("Enter velocity as a fraction of c (e.g., 0.999999999999999...):", "0.9999")
 
 try:
-    v = mp.mpf(v_input.strip())
-    if v < 0 or v >= 1:
+    if mp.mpf(v_input.strip()) < 0:
         raise ValueError("Velocity must be ≥ 0 and < 1.")
-    gamma = 1 / mp.sqrt(1 - v**2)
-    st.success(f"γ = {mp.nstr(gamma, 20)}")  # 20 significant digits
+    factors = lorentz_factors_mp(v_input, digits=20)  # 20 significant digits, certified
+    st.success(f"γ = {mp.nstr(factors.gamma, 20)}")
+    st.markdown(f"""
+- $1/\\gamma$ = `{mp.nstr(factors.inv_gamma, 20)}`
+- $\\gamma - 1$ = `{mp.nstr(factors.gamma_minus_one, 20)}`
+- Rapidity $\\eta = \\tanh^{{-1}}(v)$ = `{mp.nstr(factors.rapidity, 20)}`
+""")
+    st.caption(f"Certified relative error ≤ {mp.nstr(factors.rel_error, 3)}")
 except Exception as e:
     st.error(f"Invalid input: {e}")
 
 # -----------------------------
 # 📈 Plot: Lorentz Factor vs Velocity
 # -----------------------------
-def lorentz_gamma_array(v_array):
-    """Compute Lorentz gamma for array of velocities (excluding v ≥ c)."""
-    gamma = np.empty_like(v_array)
-    gamma[:] = np.nan
-    valid = v_array < 1.0
-    gamma[valid] = 1.0 / np.sqrt(1.0 - v_array[valid]**2)
-    return gamma
-
 v_vals = np.linspace(0, 1.2, 1000)
-gamma_vals = lorentz_gamma_array(v_vals)
+gamma_vals = lorentz_factors(v_vals).gamma  # NaN for v ≥ c
 
 fig = go.Figure()
 fig.add_trace(go.Scatter(x=v_vals, y=gamma_vals, mode="lines",
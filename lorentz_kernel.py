@@ -0,0 +1,170 @@
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+
+import numpy as np
+from mpmath import iv, mp
+
+# Speeds are fractions of c. Near c the useful number is d = 1 − |v|, not v:
+# 1 − v² = d (2 − d) and the formulas below never subtract nearly equal
+# quantities, so float64 keeps full relative precision wherever d is a
+# normal float. Only elements with d below _D_MIN go to mpmath.
+
+EPS = np.finfo(float).eps
+FLOAT_REL_ERROR = 8 * EPS   # bound on each float64 result, relative to the given (v, d)
+_D_MIN = 1e-290             # below this d (2 − d) heads into subnormals
+
+LorentzFactors = namedtuple(
+    "LorentzFactors", ["gamma", "inv_gamma", "gamma_minus_one", "rapidity", "rel_error"]
+)
+
+
+@contextmanager
+def _iv_workdps(dps):
+    # mpmath's interval context has no workdps of its own.
+    saved = iv.dps
+    iv.dps = dps
+    try:
+        yield
+    finally:
+        iv.dps = saved
+
+
+def _digits_in(text):
+    return sum(ch.isdigit() for ch in text)
+
+
+def _interval_factors(v, d, dps):
+    """γ, 1/γ, γ−1 and rapidity as mpmath intervals, plus the widest relative width."""
+    with _iv_workdps(dps):
+        v, d = iv.mpf(v), iv.mpf(d)
+        inv_gamma = iv.sqrt(d * (2 - d))
+        gamma = 1 / inv_gamma
+        gamma_minus_one = v**2 * gamma / (1 + inv_gamma)
+        rapidity = iv.log1p(2 * v / d) / 2
+        results = (gamma, inv_gamma, gamma_minus_one, rapidity)
+        rel = max((r.delta / abs(r.mid)).b if r.mid != 0 else r.delta.b for r in results)
+    return results, rel
+
+
+def lorentz_factors(v=None, one_minus_v=None):
+    """Vectorised γ, 1/γ, γ − 1 and rapidity for speeds v (fractions of c).
+
+    Pass one_minus_v as well (or instead) when it is known more precisely
+    than 1 − v, e.g. from parse_speed. Elements with |v| ≥ 1 give NaN.
+    Float64 is used wherever it is accurate; elements whose 1 − |v| is too
+    small for that are recomputed with mpmath interval arithmetic. rel_error
+    is a per-element bound on the relative error of all four results.
+    """
+    if v is None and one_minus_v is None:
+        raise ValueError("Provide v, one_minus_v, or both.")
+    if v is None:
+        d = np.asarray(one_minus_v, dtype=float)
+        speed, sign = 1 - d, np.ones_like(d)
+    else:
+        v = np.asarray(v, dtype=float)
+        speed, sign = np.abs(v), np.sign(v)
+        d = 1 - speed if one_minus_v is None else np.asarray(one_minus_v, dtype=float)
+        speed, d, sign = np.broadcast_arrays(speed, d, sign)
+
+    valid = (d > 0) & (d <= 1)
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        dd = np.where(valid, d, np.nan)
+        inv_gamma = np.sqrt(dd * (2 - dd))
+        gamma = 1 / inv_gamma
+        gamma_minus_one = speed**2 * gamma / (1 + inv_gamma)
+        rapidity = sign * 0.5 * np.log1p(2 * speed / dd)
+    rel_error = np.where(valid, FLOAT_REL_ERROR, np.nan)
+
+    escalate = valid & (d < _D_MIN)
+    if escalate.any():
+        # Work on flat copies so scalars (0-d) and arrays share one path.
+        shape = np.shape(escalate)
+        gamma, inv_gamma, gamma_minus_one, rapidity, rel_error = (
+            np.array(a, dtype=float).reshape(-1)
+            for a in (gamma, inv_gamma, gamma_minus_one, rapidity, rel_error)
+        )
+        flat_speed, flat_d, flat_sign = (np.broadcast_to(a, shape).reshape(-1) for a in (speed, d, sign))
+        for i in np.flatnonzero(escalate):
+            # The float d is exact; 30 digits leave ample room before rounding to float.
+            (g, ig, gm1, r), rel = _interval_factors(float(flat_speed[i]), float(flat_d[i]), 30)
+            gamma[i], inv_gamma[i] = float(g.mid), float(ig.mid)
+            gamma_minus_one[i], rapidity[i] = float(gm1.mid), float(flat_sign[i] * r.mid)
+            rel_error[i] = float(rel) + EPS
+        gamma, inv_gamma, gamma_minus_one, rapidity, rel_error = (
+            a.reshape(shape)[()] for a in (gamma, inv_gamma, gamma_minus_one, rapidity, rel_error)
+        )
+
+    return LorentzFactors(gamma, inv_gamma, gamma_minus_one, rapidity, rel_error)
+
+
+def gamma(v, one_minus_v=None):
+    """Lorentz factor γ for speeds v (fractions of c); NaN where |v| ≥ 1."""
+    return lorentz_factors(v, one_minus_v).gamma
+
+
+def parse_speed(text):
+    """Parse a decimal speed string into (v, 1 − |v|) as floats, both correctly rounded.
+
+    "0.999999999999999999" rounds to 1.0 as a float, but its 1 − v is kept
+    exactly, so lorentz_factors(v, d) still returns a finite γ.
+    """
+    text = text.strip()
+    with mp.workdps(_digits_in(text) + 20):
+        v = mp.mpf(text)
+        d = 1 - abs(v)
+        if d <= 0:
+            raise ValueError("Speed must satisfy |v| < 1.")
+        return float(v), float(d)
+
+
+def lorentz_factors_mp(text, digits=20):
+    """γ, 1/γ, γ − 1 and rapidity of a decimal speed string to `digits` significant digits.
+
+    Works in mpmath interval arithmetic at a local precision sized to the
+    input and request (the global mp.dps is untouched), and retries with
+    more digits until the certified relative error is below 10^-digits.
+    Returns LorentzFactors of mpf midpoints with that bound as rel_error.
+    """
+    text = text.strip()
+    dps = _digits_in(text) + digits + 10
+    with mp.workdps(dps):
+        if abs(mp.mpf(text)) >= 1:
+            raise ValueError("Speed must satisfy |v| < 1.")
+    target = mp.mpf(10) ** -digits
+    while True:
+        with _iv_workdps(dps):
+            v = iv.mpf(text)
+            speed = v if v.a >= 0 else -v
+            results, rel = _interval_factors(speed, 1 - speed, dps)
+        if rel < target:
+            break
+        dps *= 2
+    with mp.workdps(dps):
+        sign = -1 if mp.mpf(text) < 0 else 1
+        g, ig, gm1, r = (mp.mpf(x.mid) for x in results)
+        return LorentzFactors(g, ig, gm1, sign * r, mp.mpf(rel))
+
+
+def benchmark(n=1_000_000, seed=0):
+    """Time the float64 path on 1e6 speeds, and check escalated elements, array and scalar, against mpmath."""
+    rng = np.random.default_rng(seed)
+    v = rng.uniform(-0.999, 0.999, n)
+    t0 = time.perf_counter()
+    lorentz_factors(v)
+    elapsed = time.perf_counter() - t0
+    text = "0." + "9" * 300
+    exact = float(lorentz_factors_mp(text, digits=20).gamma)
+    v1, d1 = parse_speed(text)
+    array_gamma = lorentz_factors(np.array([0.5, v1]), np.array([0.5, d1])).gamma[1]
+    scalar_gamma = lorentz_factors(v1, d1).gamma
+    return {
+        "speeds_per_s": n / elapsed,
+        "escalated_array_rel_error": abs(array_gamma / exact - 1),
+        "escalated_scalar_rel_error": abs(scalar_gamma / exact - 1),
+    }
+
+
+if __name__ == "__main__":
+    for key, value in benchmark().items():
+        print(f"{key:>26}: {value:.4g}")
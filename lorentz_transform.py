@@ -0,0 +1,168 @@
+from functools import lru_cache
+
+import numpy as np
+
+from lorentz_kernel import lorentz_factors
+
+# Four-vectors are (t, x, y, z) with c = 1 and metric signature (+, −, −, −).
+ETA = np.diag([1.0, -1.0, -1.0, -1.0])
+DEFAULT_CHUNK = 1 << 20  # events per chunk when streaming
+
+
+class LorentzTransform:
+    """An immutable 4×4 Lorentz transformation acting on (t, x, y, z) rows.
+
+    Build boosts and rotations with the class methods and compose them with
+    `@` (right-hand side applied first). Composed matrices are cached, so a
+    chain rebuilt on every rerun is only multiplied out once.
+    """
+
+    def __init__(self, matrix):
+        matrix = np.array(matrix, dtype=float)
+        if matrix.shape != (4, 4):
+            raise ValueError("A Lorentz transformation is a 4×4 matrix.")
+        matrix.setflags(write=False)
+        self.matrix = matrix
+        self._key = matrix.tobytes()
+
+    @classmethod
+    def identity(cls):
+        return cls(np.eye(4))
+
+    @classmethod
+    def boost(cls, beta):
+        """Pure boost into a frame moving with velocity beta (3-vector, |β| < 1)."""
+        beta = np.asarray(beta, dtype=float)
+        b2 = beta @ beta
+        if b2 >= 1:
+            raise ValueError("Boost speed must satisfy |β| < 1.")
+        f = lorentz_factors(np.sqrt(b2))
+        g = float(f.gamma)
+        # (γ − 1) / β² written as γ / (1 + 1/γ), which is finite at β = 0.
+        k = g / (1 + float(f.inv_gamma))
+        m = np.empty((4, 4))
+        m[0, 0] = g
+        m[0, 1:] = m[1:, 0] = -g * beta
+        m[1:, 1:] = np.eye(3) + k * np.outer(beta, beta)
+        return cls(m)
+
+    @classmethod
+    def rotation(cls, axis, angle):
+        """Active rotation of the spatial axes by `angle` (rad) about `axis`."""
+        axis = np.asarray(axis, dtype=float)
+        axis = axis / np.linalg.norm(axis)
+        K = np.array([[0, -axis[2], axis[1]], [axis[2], 0, -axis[0]], [-axis[1], axis[0], 0]])
+        R = np.eye(3) + np.sin(angle) * K + (1 - np.cos(angle)) * (K @ K)
+        m = np.eye(4)
+        m[1:, 1:] = R
+        return cls(m)
+
+    def __matmul__(self, other):
+        if not isinstance(other, LorentzTransform):
+            return NotImplemented
+        return _compose(self, other)
+
+    def __eq__(self, other):
+        return isinstance(other, LorentzTransform) and self._key == other._key
+
+    def __hash__(self):
+        return hash(self._key)
+
+    def __repr__(self):
+        return f"LorentzTransform(\n{self.matrix!r})"
+
+    def inverse(self):
+        """Λ⁻¹ = η Λᵀ η, exact for any Lorentz matrix."""
+        return LorentzTransform(ETA @ self.matrix.T @ ETA)
+
+    def apply(self, events, out=None, chunk=DEFAULT_CHUNK):
+        """Transform an (N, 4) array of events. Pass out=events to work in place.
+
+        Rows are processed in slices of `chunk`, so the only temporary is one
+        (chunk, 4) block however large N is.
+        """
+        events = np.asarray(events)
+        if events.shape[-1] != 4:
+            raise ValueError("Events must have shape (..., 4).")
+        if out is None:
+            out = np.empty(events.shape, dtype=np.result_type(events, float))
+        flat_in = events.reshape(-1, 4)
+        flat_out = out.reshape(-1, 4)
+        mT = self.matrix.T
+        for start in range(0, len(flat_in), chunk):
+            block = flat_in[start:start + chunk] @ mT
+            flat_out[start:start + chunk] = block
+        return out
+
+    def apply_columns(self, vectors, out=None, chunk=DEFAULT_CHUNK):
+        """Transform a FourVectorArray chunk by chunk; out=None works in place.
+
+        Works on memory-mapped arrays: each chunk is read, transformed and
+        written back before the next one is touched.
+        """
+        out = vectors if out is None else out
+        for start, block in vectors.chunks(chunk):
+            out.columns[:, start:start + block.shape[1]] = self.matrix @ block
+        out.flush()
+        return out
+
+
+@lru_cache(maxsize=256)
+def _compose(a, b):
+    return LorentzTransform(a.matrix @ b.matrix)
+
+
+class FourVectorArray:
+    """Columnar store of N four-vectors: one contiguous (4, N) float array.
+
+    The columns can live in memory or in a .npy file opened as a memory map,
+    so transforms can stream through files far larger than RAM.
+    """
+
+    def __init__(self, columns):
+        if columns.ndim != 2 or columns.shape[0] != 4:
+            raise ValueError("Columns must have shape (4, N).")
+        self.columns = columns
+
+    @classmethod
+    def from_columns(cls, t, x, y, z):
+        return cls(np.stack([t, x, y, z]).astype(float))
+
+    @classmethod
+    def from_rows(cls, events):
+        return cls(np.ascontiguousarray(np.asarray(events, dtype=float).T))
+
+    @classmethod
+    def create(cls, path, n):
+        """New zero-filled .npy-backed array of n four-vectors."""
+        return cls(np.lib.format.open_memmap(path, mode="w+", dtype=float, shape=(4, n)))
+
+    @classmethod
+    def open(cls, path, mode="r+"):
+        """Memory-map an existing (4, N) .npy file."""
+        return cls(np.load(path, mmap_mode=mode))
+
+    def __len__(self):
+        return self.columns.shape[1]
+
+    t = property(lambda self: self.columns[0])
+    x = property(lambda self: self.columns[1])
+    y = property(lambda self: self.columns[2])
+    z = property(lambda self: self.columns[3])
+
+    def chunks(self, size=DEFAULT_CHUNK):
+        """Yield (start, (4, n) block) pairs covering the array."""
+        for start in range(0, len(self), size):
+            yield start, np.asarray(self.columns[:, start:start + size])
+
+    def as_rows(self):
+        return self.columns.T
+
+    def interval(self):
+        """Invariant s² = t² − x² − y² − z² of every vector."""
+        t, x, y, z = self.columns
+        return t**2 - x**2 - y**2 - z**2
+
+    def flush(self):
+        if isinstance(self.columns, np.memmap):
+            self.columns.flush()
@@ -0,0 +1,139 @@
+import io
+from functools import lru_cache
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import LineCollection
+from matplotlib.figure import Figure
+
+from lorentz_transform import FourVectorArray, LorentzTransform
+
+# Diagram coordinates are (x, ct) with c = 1; events are (t, x, y, z) rows.
+EXTENT = 5.0
+DENSE_EVENTS = 50_000  # above this, clouds are drawn as a density image
+
+
+def load_events(source):
+    """Read events from a path or uploaded file into a FourVectorArray.
+
+    Columns are (t, x) or (t, x, y, z). .npy files given by path are
+    memory-mapped when already stored as (4, N) float64 columns; CSV may
+    have a header line.
+    """
+    name = getattr(source, "name", str(source))
+    if hasattr(source, "seek"):
+        source.seek(0)  # uploads are re-read on a cache miss
+    if name.lower().endswith(".npy"):
+        data = np.load(source, mmap_mode="r") if isinstance(source, str) else np.load(source)
+        if data.ndim == 2 and data.shape[0] == 4 and data.shape[1] != 4 and data.dtype == float:
+            return FourVectorArray(data)
+    else:
+        if hasattr(source, "read"):
+            raw = source.read()
+        else:
+            with open(source, "rb") as fh:
+                raw = fh.read()
+        text = raw.decode() if isinstance(raw, bytes) else raw
+        first = text.split("\n", 1)[0]
+        skip = 0 if all(_is_number(x) for x in first.split(",")) else 1
+        data = np.loadtxt(io.StringIO(text), delimiter=",", skiprows=skip, ndmin=2)
+    if data.ndim != 2 or data.shape[1] not in (2, 4):
+        raise ValueError("Events need two (t, x) or four (t, x, y, z) columns.")
+    t, x = data[:, 0], data[:, 1]
+    y, z = (data[:, 2], data[:, 3]) if data.shape[1] == 4 else (np.zeros(len(data)),) * 2
+    return FourVectorArray.from_columns(t, x, y, z)
+
+
+def _is_number(text):
+    try:
+        float(text)
+        return True
+    except ValueError:
+        return False
+
+
+def boost_events(events, v):
+    """Coordinates of every event in a frame moving at v along x, in one chunked pass."""
+    out = FourVectorArray(np.empty(events.columns.shape))
+    return LorentzTransform.boost([v, 0, 0]).apply_columns(events, out=out)
+
+
+def rest_grid_segments(extent=EXTENT, spacing=1.0):
+    """(n, 2, 2) segments of the x = const and t = const lines, excluding the axes."""
+    ticks = np.arange(-extent + spacing, extent, spacing)
+    ticks = ticks[np.abs(ticks) > 1e-9]
+    lo, hi = np.full_like(ticks, -extent), np.full_like(ticks, extent)
+    horizontal = np.stack([np.stack([lo, ticks], -1), np.stack([hi, ticks], -1)], axis=1)
+    vertical = np.stack([np.stack([ticks, lo], -1), np.stack([ticks, hi], -1)], axis=1)
+    return np.concatenate([horizontal, vertical])
+
+
+def moving_grid_segments(v, extent=EXTENT, spacing=1.0):
+    """(n, 2, 2) segments of the S′ grid (x′ = const and t′ = const) drawn in S coordinates."""
+    ticks = np.arange(-extent, extent + spacing / 2, spacing)
+    lo, hi = np.full_like(ticks, -extent), np.full_like(ticks, extent)
+    zero = np.zeros(2 * len(ticks))
+    # Endpoints in S′ as (t′, x′): lines of constant t′, then constant x′.
+    t_p = np.concatenate([ticks, ticks, lo, hi])
+    x_p = np.concatenate([lo, hi, ticks, ticks])
+    events = np.stack([t_p, x_p, np.concatenate([zero, zero]), np.concatenate([zero, zero])], axis=-1)
+    t, x = LorentzTransform.boost([-v, 0, 0]).apply(events)[:, :2].T
+    n = len(ticks)
+    start = np.concatenate([np.stack([x[:n], t[:n]], -1), np.stack([x[2 * n:3 * n], t[2 * n:3 * n]], -1)])
+    end = np.concatenate([np.stack([x[n:2 * n], t[n:2 * n]], -1), np.stack([x[3 * n:], t[3 * n:]], -1)])
+    return np.stack([start, end], axis=1)
+
+
+@lru_cache(maxsize=8)
+def static_layer(width_px, height_px, extent=EXTENT, spacing=1.0):
+    """Transparent RGBA raster of the light cone, the S axes and the S grid.
+
+    Rendered once per axes size with Agg; pages draw it with imshow under
+    the velocity-dependent layers instead of re-adding ~20 line artists.
+    """
+    fig = Figure(figsize=(width_px / 100, height_px / 100), dpi=100)
+    FigureCanvasAgg(fig)
+    fig.patch.set_alpha(0)
+    ax = fig.add_axes([0, 0, 1, 1])
+    ax.set_xlim(-extent, extent)
+    ax.set_ylim(-extent, extent)
+    ax.axis("off")
+    ax.add_collection(LineCollection(rest_grid_segments(extent, spacing),
+                                     colors="gray", linewidths=0.5, alpha=0.2))
+    cone = np.array([[[-extent, -extent], [extent, extent]], [[-extent, extent], [extent, -extent]]])
+    ax.add_collection(LineCollection(cone, colors="k", linestyles="--", alpha=0.3))
+    ax.add_collection(LineCollection([[[-extent, 0], [extent, 0]], [[0, -extent], [0, extent]]],
+                                     colors="black", linewidths=1))
+    fig.canvas.draw()
+    img = np.asarray(fig.canvas.buffer_rgba()).copy()
+    img.setflags(write=False)
+    return img
+
+
+def draw_static(ax, extent=EXTENT, dpi=200):
+    """Composite the cached static layer into `ax`, sized to its pixel extent at `dpi`.
+
+    The default matches the resolution st.pyplot saves figures at.
+    """
+    ax.set_xlim(-extent, extent)
+    ax.set_ylim(-extent, extent)
+    ax.apply_aspect()
+    box = ax.get_window_extent()
+    scale = dpi / ax.figure.dpi
+    layer = static_layer(max(1, round(box.width * scale)), max(1, round(box.height * scale)), extent)
+    ax.imshow(layer, extent=(-extent, extent, -extent, extent), zorder=0,
+              interpolation="nearest", aspect="auto")
+
+
+def draw_events(ax, x, t, color="tab:purple", label=None, extent=EXTENT, max_points=DENSE_EVENTS):
+    """Scatter an event cloud, rasterised; beyond max_points draw a density image instead."""
+    x, t = np.asarray(x), np.asarray(t)
+    if len(x) <= max_points:
+        ax.scatter(x, t, s=4, color=color, alpha=0.6, label=label, rasterized=True, zorder=3)
+        return
+    counts, _, _ = np.histogram2d(t, x, bins=400, range=[[-extent, extent], [-extent, extent]])
+    density = np.ma.masked_equal(np.log1p(counts), 0)
+    ax.imshow(density, extent=(-extent, extent, -extent, extent), origin="lower", cmap="plasma",
+              interpolation="nearest", aspect="auto", alpha=0.8, zorder=3)
+    if label:
+        ax.scatter([], [], s=4, color=color, label=label)  # legend entry for the image
@@ -1,6 +1,12 @@
 import streamlit as st
 import numpy as np
+from lorentz_kernel import gamma as lorentz_gamma
 import matplotlib.pyplot as plt
+import os
+import time
+from muon_montecarlo import stream_survival, check_against_analytic
+from muon_spectrum import (DEFAULT_DEPTHS_KM, load_spectrum_file, power_law_spectrum,
+                           survival_fraction, survival_table)
 
 # Streamlit Setup
 st.set_page_config(page_title="Muon Lifetime Simulator", layout="centered")
@@ -32,7 +38,7 @@ with col3:
 # ---------- Calculations ----------
 h = h_km * 1000  # m
 v = v_frac * c
-gamma = 1 / np.sqrt(1 - v**2 / c**2)
+gamma = lorentz_gamma(v_frac)
 t_Earth = h / v
 tau_dilated = gamma * tau_0
 
@@ -79,6 +85,106 @@ ax.legend()
 ax.grid(True)
 st.pyplot(fig)
 
+# ---------- Energy Spectrum Mode ----------
+st.subheader("🌈 Survival Over a Cosmic-Ray Energy Spectrum")
+st.markdown("""
+Real muons do not all share one speed. Here the survival fraction is averaged over an energy spectrum.
+The integral is tabulated once per spectrum over a grid of depths, so moving the depth slider only
+interpolates in that table.
+""")
+
+spec_kind = st.radio("Spectrum", ["Power law", "Tabulated file (CSV: energy GeV, flux)"], horizontal=True)
+spectrum = None
+if spec_kind == "Power law":
+    sp_col1, sp_col2, sp_col3 = st.columns(3)
+    with sp_col1:
+        spec_index = st.slider("Spectral index", 1.5, 4.0, 2.7, step=0.1)
+    with sp_col2:
+        e_min = st.number_input("E_min (GeV)", min_value=0.2, value=1.0, step=0.5)
+    with sp_col3:
+        e_max = st.number_input("E_max (GeV)", min_value=1.0, value=1000.0, step=100.0)
+    if e_max > e_min:
+        spectrum = power_law_spectrum(spec_index, e_min, e_max)
+    else:
+        st.error("E_max must be larger than E_min.")
+else:
+    spec_file = st.file_uploader("Upload spectrum", type=["csv", "txt"])
+    if spec_file is not None:
+        try:
+            spectrum = load_spectrum_file(spec_file)
+        except Exception as e:
+            st.error(f"Could not read spectrum: {e}")
+
+if spectrum is not None:
+    depth_grid = np.asarray(DEFAULT_DEPTHS_KM)
+    table = survival_table(spectrum)
+    frac_here = float(survival_fraction(spectrum, h_km))
+
+    st.metric("Spectrum-Averaged Survival at Surface", f"{frac_here:.4f}",
+              help=f"Single-speed value at v = {v_frac}c: {N_survive / N0:.4f}")
+
+    fig, ax = plt.subplots(figsize=(8, 4))
+    ax.plot(depth_grid, N0 * table, color='darkorange', label=f"Spectrum: {spectrum.label}")
+    ax.plot(altitudes / 1000, muons_SR, color='blue', linestyle='--', label=f"Single speed v = {v_frac}c")
+    ax.axvline(x=h_km, color='gray', linestyle=':', label=f"Surface @ {h_km} km")
+    ax.set_xlabel("Altitude (km)")
+    ax.set_ylabel("Surviving Muons")
+    ax.set_yscale("log")
+    ax.legend()
+    ax.grid(True)
+    st.pyplot(fig)
+    plt.close(fig)
+
+# ---------- Monte Carlo Mode ----------
+st.subheader("🎲 Monte Carlo: Individual Muon Lifetimes")
+st.markdown("""
+Instead of the smooth exponential, sample each muon's proper lifetime and follow it down.
+Chunks of muons are spread over worker processes, each with its own reproducible random stream,
+and the survival histogram fills in as chunks finish.
+""")
+
+mc_col1, mc_col2, mc_col3 = st.columns(3)
+with mc_col1:
+    n_mc = st.number_input("Muons to simulate", min_value=10_000, max_value=1_000_000_000,
+                           value=10_000_000, step=1_000_000)
+with mc_col2:
+    mc_workers = st.number_input("Worker processes", min_value=1, max_value=os.cpu_count() or 1,
+                                 value=os.cpu_count() or 1)
+with mc_col3:
+    mc_seed = st.number_input("Random seed", min_value=0, value=0)
+
+if st.button("▶️ Run Monte Carlo"):
+    mc_plot = st.empty()
+    mc_status = st.empty()
+    last_draw = 0.0
+    for result in stream_survival(int(n_mc), h, v_frac, chunk_size=1_000_000,
+                                  seed=int(mc_seed), workers=int(mc_workers)):
+        finished = result["muons_done"] == n_mc
+        if not finished and time.perf_counter() - last_draw < 0.5:
+            continue
+        last_draw = time.perf_counter()
+
+        scale = N0 / result["muons_done"]
+        fig, ax = plt.subplots(figsize=(8, 5))
+        ax.step(result["edges_m"] / 1000, result["survivors"] * scale, where="post",
+                label="Monte Carlo (scaled to N₀)", color='purple')
+        ax.plot(altitudes / 1000, muons_SR, label="Analytic (Relativity)", color='blue', linestyle='--')
+        ax.set_xlabel("Altitude (km)")
+        ax.set_ylabel("Surviving Muons")
+        ax.set_title("Sampled Muon Decay During Descent")
+        ax.legend()
+        ax.grid(True)
+        mc_plot.pyplot(fig)
+        plt.close(fig)
+        mc_status.info(f"{result['muons_done']:,} / {int(n_mc):,} muons · "
+                       f"{result['muons_per_s']:.3g} muons/s")
+
+    z_max, ok = check_against_analytic(result, v_frac)
+    if ok:
+        st.success(f"✅ Matches the analytic curve (largest deviation {z_max:.2f}σ).")
+    else:
+        st.warning(f"⚠️ Deviation of {z_max:.2f}σ from the analytic curve.")
+
 # ---------- Final Survival Counts ----------
 st.subheader("📊 Ground-Level Muon Count Comparison")
 st.markdown(f"""
@@ -0,0 +1,95 @@
+import hashlib
+from functools import lru_cache
+
+import numpy as np
+
+c = 3e8  # speed of light in m/s
+tau_0 = 2.2e-6  # muon lifetime in seconds (rest frame)
+m_mu = 0.1056584  # muon rest energy in GeV
+
+DEFAULT_DEPTHS_KM = tuple(np.round(np.linspace(0.0, 20.0, 81), 6))
+
+
+class Spectrum:
+    """Muon energy spectrum reduced to quadrature nodes in total energy (GeV).
+
+    Nodes are Gauss–Legendre points in log E, and weights already include
+    the Jacobian and the spectrum, normalised to sum to one. Two spectra
+    compare equal when their nodes and weights do, so they can key a cache.
+    """
+
+    def __init__(self, energies, weights, label):
+        self.energies = np.asarray(energies, dtype=float)
+        self.weights = np.asarray(weights, dtype=float) / np.sum(weights)
+        self.label = label
+        digest = hashlib.sha1(self.energies.tobytes() + self.weights.tobytes())
+        self.key = digest.hexdigest()
+
+    def __hash__(self):
+        return hash(self.key)
+
+    def __eq__(self, other):
+        return isinstance(other, Spectrum) and self.key == other.key
+
+    def __repr__(self):
+        return f"Spectrum({self.label!r}, {len(self.energies)} nodes)"
+
+
+def _log_nodes(e_min, e_max, n_nodes):
+    x, w = np.polynomial.legendre.leggauss(n_nodes)
+    lo, hi = np.log(e_min), np.log(e_max)
+    log_e = 0.5 * (hi - lo) * x + 0.5 * (hi + lo)
+    energies = np.exp(log_e)
+    return energies, 0.5 * (hi - lo) * w * energies  # dE = E d(log E)
+
+
+def power_law_spectrum(index=2.7, e_min=1.0, e_max=1000.0, n_nodes=200):
+    """dN/dE ∝ E^-index between e_min and e_max (GeV, total energy)."""
+    if e_min <= m_mu:
+        raise ValueError(f"e_min must exceed the muon rest energy ({m_mu} GeV).")
+    energies, dE = _log_nodes(e_min, e_max, n_nodes)
+    return Spectrum(energies, dE * energies**-index, f"E^-{index:g}, {e_min:g}–{e_max:g} GeV")
+
+
+def tabulated_spectrum(energies, flux, n_nodes=200, label="tabulated"):
+    """Spectrum from tabulated (E [GeV], dN/dE) points, interpolated log-log."""
+    energies = np.asarray(energies, dtype=float)
+    flux = np.asarray(flux, dtype=float)
+    keep = (energies > m_mu) & (flux > 0)
+    energies, flux = energies[keep], flux[keep]
+    if energies.size < 2:
+        raise ValueError("Need at least two points with E > m_μ and positive flux.")
+    order = np.argsort(energies)
+    energies, flux = energies[order], flux[order]
+    nodes, dE = _log_nodes(energies[0], energies[-1], n_nodes)
+    node_flux = np.exp(np.interp(np.log(nodes), np.log(energies), np.log(flux)))
+    return Spectrum(nodes, dE * node_flux, label)
+
+
+def load_spectrum_file(file, n_nodes=200):
+    """Read a two-column CSV (energy in GeV, flux); header lines are skipped."""
+    data = np.genfromtxt(file, delimiter=",", dtype=float)
+    data = data[~np.isnan(data).any(axis=1)]
+    return tabulated_spectrum(data[:, 0], data[:, 1], n_nodes=n_nodes,
+                              label=getattr(file, "name", "tabulated"))
+
+
+@lru_cache(maxsize=64)
+def survival_table(spectrum, depths_km=DEFAULT_DEPTHS_KM):
+    """Spectrum-averaged survival fraction at each depth, computed once per key.
+
+    A muon of total energy E has βγ = p / m, so its decay length is
+    (p / m) c τ₀. The whole (depth × energy) integrand is one array.
+    """
+    depths = np.asarray(depths_km, dtype=float) * 1e3
+    p = np.sqrt(spectrum.energies**2 - m_mu**2)
+    decay_length = (p / m_mu) * c * tau_0
+    table = np.exp(-depths[:, None] / decay_length[None, :]) @ spectrum.weights
+    table.setflags(write=False)
+    return table
+
+
+def survival_fraction(spectrum, h_km, depths_km=DEFAULT_DEPTHS_KM):
+    """Look up survival at h_km, interpolating log S between tabulated depths."""
+    table = survival_table(spectrum, tuple(depths_km))
+    return np.exp(np.interp(h_km, depths_km, np.log(table)))
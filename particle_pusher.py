@@ -0,0 +1,189 @@
+import os
+import time
+from collections import namedtuple
+
+import numpy as np
+
+# Units are c = 1: positions x and times t in the same length unit, momenta
+# as u = γv (momentum per unit mass), E and B as in field_boost.py, and qm
+# the charge-to-mass ratio. Pushers are leapfrog: x lives at whole steps and
+# u half a step behind, as usual for Boris-type schemes.
+
+PUSH_CHUNK = 1 << 16  # particles pushed together; keeps temporaries in cache
+
+PushResult = namedtuple("PushResult", ["x", "u", "t", "steps_per_s", "pushes_per_s"])
+
+
+class UniformField:
+    """The same E and B everywhere, e.g. the page's input or boosted fields."""
+
+    def __init__(self, E, B):
+        self.E = np.asarray(E, dtype=float)
+        self.B = np.asarray(B, dtype=float)
+
+    def __call__(self, x, t):
+        return np.broadcast_to(self.E, x.shape), np.broadcast_to(self.B, x.shape)
+
+
+class GridField:
+    """E and B on a regular (nx, ny, nz, 3) grid, trilinearly interpolated.
+
+    Grid point (i, j, k) sits at origin + spacing·(i, j, k). Outside the grid
+    the nearest edge value is used. E and B are packed into one array so each
+    particle gathers its eight neighbouring cells once.
+    """
+
+    def __init__(self, E, B, origin=(0.0, 0.0, 0.0), spacing=1.0):
+        E, B = np.asarray(E), np.asarray(B)
+        if E.shape != B.shape or E.ndim != 4 or E.shape[-1] != 3:
+            raise ValueError("E and B must have the same shape (nx, ny, nz, 3).")
+        if min(E.shape[:3]) < 2:
+            raise ValueError("The grid needs at least two points along each axis.")
+        self.shape = np.array(E.shape[:3])
+        self.origin = np.asarray(origin, dtype=float)
+        self.spacing = np.broadcast_to(np.asarray(spacing, dtype=float), (3,))
+        self._packed = np.concatenate([E, B], axis=-1).reshape(-1, 6)
+        self._strides = np.array([self.shape[1] * self.shape[2], self.shape[2], 1])
+        self._corners = (np.arange(8)[:, None] >> np.array([2, 1, 0])) & 1
+
+    def __call__(self, x, t):
+        s = (x - self.origin) / self.spacing
+        i = np.clip(np.floor(s).astype(np.int64), 0, self.shape - 2)
+        f = np.clip(s - i, 0.0, 1.0)
+        w = np.prod(np.where(self._corners, f[:, None, :], 1 - f[:, None, :]), axis=2)
+        values = self._packed[(i @ self._strides)[:, None] + self._corners @ self._strides]
+        out = np.einsum("nc,ncj->nj", w, values)
+        return out[:, :3], out[:, 3:]
+
+
+def boris_step(x, u, E, B, qm, dt):
+    """One relativistic Boris step, in place: half electric kick, magnetic rotation, half kick, drift."""
+    h = 0.5 * qm * dt
+    u += h * E
+    t = h * B / np.sqrt(1 + np.einsum("ij,ij->i", u, u))[:, None]
+    s = 2 * t / (1 + np.einsum("ij,ij->i", t, t))[:, None]
+    u += np.cross(u + np.cross(u, t), s)
+    u += h * E
+    x += dt * u / np.sqrt(1 + np.einsum("ij,ij->i", u, u))[:, None]
+
+
+def vay_step(x, u, E, B, qm, dt):
+    """One Vay step, in place. Unlike Boris it keeps E + v×B = 0 drifts exact at large γ."""
+    h = 0.5 * qm * dt
+    v = u / np.sqrt(1 + np.einsum("ij,ij->i", u, u))[:, None]
+    u_p = u + h * (2 * E + np.cross(v, B))
+    tau = h * B
+    tau2 = np.einsum("ij,ij->i", tau, tau)
+    u_star = np.einsum("ij,ij->i", u_p, tau)
+    sigma = 1 + np.einsum("ij,ij->i", u_p, u_p) - tau2
+    g = np.sqrt(0.5 * (sigma + np.sqrt(sigma ** 2 + 4 * (tau2 + u_star ** 2))))
+    t = tau / g[:, None]
+    s = 1 / (1 + np.einsum("ij,ij->i", t, t))
+    u[:] = s[:, None] * (u_p + np.einsum("ij,ij->i", u_p, t)[:, None] * t + np.cross(u_p, t))
+    x += dt * u / np.sqrt(1 + np.einsum("ij,ij->i", u, u))[:, None]
+
+
+STEPPERS = {"boris": boris_step, "vay": vay_step}
+
+
+class TrajectoryStore:
+    """Trajectory snapshots on disk: a directory of .npy memory maps.
+
+    x.npy and u.npy have shape (n_snapshots, N, 3) in float32, so each
+    snapshot is one contiguous chunk and a run never holds more than the
+    particles being pushed; t.npy holds the snapshot times.
+    """
+
+    def __init__(self, path, x, u, t):
+        self.path, self.x, self.u, self.t = path, x, u, t
+
+    @classmethod
+    def create(cls, path, n_snapshots, n_particles):
+        os.makedirs(path, exist_ok=True)
+        shape = (n_snapshots, n_particles, 3)
+        open_memmap = np.lib.format.open_memmap
+        return cls(path,
+                   open_memmap(os.path.join(path, "x.npy"), mode="w+", dtype=np.float32, shape=shape),
+                   open_memmap(os.path.join(path, "u.npy"), mode="w+", dtype=np.float32, shape=shape),
+                   open_memmap(os.path.join(path, "t.npy"), mode="w+", dtype=float, shape=(n_snapshots,)))
+
+    @classmethod
+    def open(cls, path, mode="r"):
+        return cls(path, *(np.load(os.path.join(path, f"{name}.npy"), mmap_mode=mode) for name in "xut"))
+
+    def __len__(self):
+        return len(self.t)
+
+    def particle(self, i):
+        """(t, x, u) of particle i over all snapshots."""
+        return np.asarray(self.t), np.asarray(self.x[:, i]), np.asarray(self.u[:, i])
+
+    def flush(self):
+        for arr in (self.x, self.u, self.t):
+            arr.flush()
+
+
+def push(x, u, qm, fields, dt, n_steps, method="boris", store=None, snapshot_every=1,
+         t0=0.0, chunk=PUSH_CHUNK):
+    """Advance particles through `fields` for n_steps, in place.
+
+    x and u are (N, 3) arrays (memory maps work); qm is a scalar or (N,)
+    array; fields(x, t) returns (E, B) at the positions, e.g. UniformField or
+    GridField. Particles are pushed in chunks through every step, so the
+    temporaries stay small. With a TrajectoryStore of
+    n_steps // snapshot_every + 1 snapshots, the start and every
+    snapshot_every-th step are recorded. Returns PushResult with the
+    ensemble steps per second and particle pushes per second.
+    """
+    step = STEPPERS[method]
+    qm = np.asarray(qm, dtype=float)
+    n = len(x)
+    if store is not None:
+        store.t[:] = t0 + dt * snapshot_every * np.arange(len(store))
+    start_time = time.perf_counter()
+    for start in range(0, n, chunk):
+        sl = slice(start, start + chunk)
+        xc, uc = np.array(x[sl], dtype=float), np.array(u[sl], dtype=float)
+        qc = qm[sl, None] if qm.ndim else qm
+        if store is not None:
+            store.x[0, sl], store.u[0, sl] = xc, uc
+        for k in range(1, n_steps + 1):
+            E, B = fields(xc, t0 + (k - 1) * dt)
+            step(xc, uc, E, B, qc, dt)
+            if store is not None and k % snapshot_every == 0:
+                store.x[k // snapshot_every, sl], store.u[k // snapshot_every, sl] = xc, uc
+        x[sl], u[sl] = xc, uc
+    elapsed = max(time.perf_counter() - start_time, 1e-12)
+    if store is not None:
+        store.flush()
+    return PushResult(x, u, t0 + n_steps * dt, n_steps / elapsed, n * n_steps / elapsed)
+
+
+def benchmark(n_particles=1_000_000, n_steps=10, seed=0):
+    """Push 1e6 particles in a uniform B field (Boris and Vay) and in a gridded field.
+
+    In a pure magnetic field |u| is an invariant of the exact motion and of
+    both rotations, so its drift measures round-off only.
+    """
+    rng = np.random.default_rng(seed)
+    x0 = rng.uniform(-1, 1, (n_particles, 3))
+    u0 = rng.normal(0, 2, (n_particles, 3))
+    results = {}
+    for method in STEPPERS:
+        x, u = x0.copy(), u0.copy()
+        res = push(x, u, 1.0, UniformField([0, 0, 0], [0, 0, 1]), 0.05, n_steps, method)
+        drift = np.abs(np.linalg.norm(u, axis=1) / np.linalg.norm(u0, axis=1) - 1).max()
+        results[f"{method}_pushes_per_s"] = res.pushes_per_s
+        results[f"{method}_max_|u|_drift"] = drift
+    axis = np.linspace(-2, 2, 64)
+    r = np.stack(np.meshgrid(axis, axis, axis, indexing="ij"), axis=-1)
+    grid = GridField(0.1 * r, np.broadcast_to([0.0, 0.0, 1.0], r.shape), origin=(-2, -2, -2), spacing=axis[1] - axis[0])
+    res = push(x0.copy(), u0.copy(), 1.0, grid, 0.05, n_steps)
+    results["grid_pushes_per_s"] = res.pushes_per_s
+    results["grid_steps_per_s"] = res.steps_per_s
+    return results
+
+
+if __name__ == "__main__":
+    for key, value in benchmark().items():
+        print(f"{key:>22}: {value:.4g}")
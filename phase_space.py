@@ -0,0 +1,163 @@
+import time
+from collections import namedtuple
+
+import numpy as np
+
+# Natural units (c = 1). Four-momenta are (E, px, py, pz) in the last axis;
+# an event batch is an (N, n, 4) array for n final-state particles.
+# Events are drawn with the Raubold–Lynch (GENBOD) method: random
+# intermediate invariant masses, then successive isotropic two-body decays.
+# Each event carries a weight ∝ its phase-space density, scaled to at most 1.
+
+EVENT_CHUNK = 1 << 18  # events per chunk from generate_chunks()
+
+DecayEvents = namedtuple("DecayEvents", ["p4", "weights"])
+
+
+def two_body_momentum(M, m1, m2):
+    """Momentum of each daughter when M decays to m1 + m2 at rest (0 below threshold)."""
+    M, m1, m2 = (np.asarray(a, dtype=float) for a in (M, m1, m2))
+    s = (M * M - (m1 + m2) ** 2) * (M * M - (m1 - m2) ** 2)
+    return np.sqrt(np.maximum(s, 0.0)) / (2 * M)
+
+
+def boost(p4, beta):
+    """Four-momenta (N, ..., 4) as seen when their frame moves with velocity beta (N, 3)."""
+    beta = np.asarray(beta, dtype=float)
+    b2 = np.einsum("ni,ni->n", beta, beta)
+    g = 1 / np.sqrt(1 - b2)
+    shape = (len(beta),) + (1,) * (p4.ndim - 2)
+    g, b = g.reshape(shape), beta.reshape(shape + (3,))
+    bp = np.einsum("...i,...i->...", b, p4[..., 1:])
+    out = np.empty_like(p4)
+    out[..., 0] = g * (p4[..., 0] + bp)
+    # (γ − 1)/β² written as γ²/(γ + 1), finite at β = 0
+    out[..., 1:] = p4[..., 1:] + ((g * g / (g + 1) * bp + g * p4[..., 0])[..., None]) * b
+    return out
+
+
+def _isotropic(rng, n):
+    cos_t = rng.uniform(-1, 1, n)
+    phi = rng.uniform(0, 2 * np.pi, n)
+    sin_t = np.sqrt(1 - cos_t * cos_t)
+    return np.stack([sin_t * np.cos(phi), sin_t * np.sin(phi), cos_t], axis=-1)
+
+
+def max_weight(M, masses):
+    """Upper bound of the Raubold–Lynch weight, used to scale weights into (0, 1]."""
+    masses = np.asarray(masses, dtype=float)
+    kinetic = M - masses.sum()
+    lo, hi, w = 0.0, kinetic + masses[0], 1.0
+    for k in range(1, len(masses)):
+        lo += masses[k - 1]
+        hi += masses[k]
+        w *= two_body_momentum(hi, lo, masses[k])
+    return float(w)
+
+
+def decay(p_parent, masses, n_events, rng=None):
+    """Phase-space decays of a parent with four-momentum p_parent into `masses`.
+
+    p_parent is (E, px, py, pz) — a particle, or the total four-momentum of
+    a scattering initial state — or one per event as (n_events, 4).
+    Raises ValueError below threshold, or at it for three or more
+    daughters, where phase space has no volume. Returns DecayEvents with p4 of
+    shape (n_events, n, 4) in the frame of p_parent, and weights.
+    """
+    rng = np.random.default_rng(rng)
+    masses = np.asarray(masses, dtype=float)
+    n = len(masses)
+    if n < 2:
+        raise ValueError("A decay needs at least two daughters.")
+    p_parent = np.broadcast_to(np.asarray(p_parent, dtype=float), (n_events, 4))
+    M2 = p_parent[:, 0] ** 2 - np.einsum("ni,ni->n", p_parent[:, 1:], p_parent[:, 1:])
+    M = np.sqrt(np.maximum(M2, 0.0))
+    if np.any(M < masses.sum()):
+        raise ValueError("The parent's invariant mass is below the sum of the daughter masses.")
+    if n > 2 and np.any(M == masses.sum()):
+        raise ValueError("The parent's invariant mass must exceed the sum of three or more daughter masses.")
+
+    # Invariant masses of the subsystems {0..k}: sorted uniforms share out the kinetic energy.
+    r = np.zeros((n_events, n))
+    r[:, 1:-1] = np.sort(rng.random((n_events, n - 2)), axis=1)
+    r[:, -1] = 1.0
+    inv_mass = r * (M - masses.sum())[:, None] + np.cumsum(masses)
+    pd = two_body_momentum(inv_mass[:, 1:], inv_mass[:, :-1], masses[1:])
+    weights = np.prod(pd, axis=1) / max_weight(M.max(), masses) if n > 2 else np.ones(n_events)
+
+    p4 = np.zeros((n_events, n, 4))
+    direction = _isotropic(rng, n_events) * pd[:, :1]
+    p4[:, 0, 1:], p4[:, 1, 1:] = -direction, direction
+    p4[:, :2, 0] = np.sqrt(pd[:, :1] ** 2 + masses[:2] ** 2)
+    for k in range(2, n):
+        # In the rest frame of subsystem {0..k}, particle k recoils against {0..k−1}.
+        direction = _isotropic(rng, n_events) * pd[:, k - 1:k]
+        e_sub = np.sqrt(pd[:, k - 1] ** 2 + inv_mass[:, k - 1] ** 2)
+        p4[:, :k] = boost(p4[:, :k], -direction / e_sub[:, None])
+        p4[:, k, 1:] = direction
+        p4[:, k, 0] = np.sqrt(pd[:, k - 1] ** 2 + masses[k] ** 2)
+    p4 = boost(p4, p_parent[:, 1:] / p_parent[:, :1])
+    return DecayEvents(p4, weights)
+
+
+def generate_chunks(p_parent, masses, n_events, chunk=EVENT_CHUNK, seed=0):
+    """Yield DecayEvents in chunks until n_events have been drawn; memory is bounded by `chunk`.
+
+    p_parent is one four-momentum or one per event, (n_events, 4), as for decay().
+    """
+    rng = np.random.default_rng(seed)
+    p_parent = np.asarray(p_parent, dtype=float)
+    for start in range(0, n_events, chunk):
+        size = min(chunk, n_events - start)
+        parents = p_parent[start:start + size] if p_parent.ndim == 2 else p_parent
+        yield decay(parents, masses, size, rng)
+
+
+def scattering(p_a, p_b, masses, n_events, rng=None):
+    """Phase-space events for a + b → `masses`: a decay of the total four-momentum."""
+    return decay(np.asarray(p_a, dtype=float) + np.asarray(p_b, dtype=float), masses, n_events, rng)
+
+
+def on_shell(p4, masses, atol=1e-6, rtol=1e-9):
+    """Per-event check that every particle satisfies E² = p² + m², as on the verifier page.
+
+    The verifier's absolute tolerance is kept; a relative one is added so
+    that energetic particles are judged at their own scale.
+    """
+    E2 = p4[..., 0] ** 2
+    rhs = np.einsum("...i,...i->...", p4[..., 1:], p4[..., 1:]) + np.asarray(masses, dtype=float) ** 2
+    return np.isclose(E2, rhs, rtol=rtol, atol=atol).all(axis=-1)
+
+
+def conserves(p4, p_parent, atol=1e-9):
+    """Per-event check that the daughters' four-momenta add up to the parent's."""
+    total = p4.sum(axis=1)
+    scale = np.maximum(np.abs(np.asarray(p_parent, dtype=float)[..., :1]), 1.0)
+    return np.all(np.abs(total - p_parent) <= atol * scale, axis=-1)
+
+
+def benchmark(n_events=10_000_000, seed=0):
+    """Draw 1e7 three-body decays of a moving parent in chunks and check every event."""
+    masses = [0.1396, 0.1396, 0.1350]  # π+ π− π0 from an η-like parent, GeV
+    M, p = 0.5479, 2.0
+    parent = np.array([np.hypot(M, p), 0.0, 0.0, p])
+    t0 = time.perf_counter()
+    n_ok = n_conserved = 0
+    weight_sum = 0.0
+    for events in generate_chunks(parent, masses, n_events, seed=seed):
+        n_ok += int(on_shell(events.p4, masses).sum())
+        n_conserved += int(conserves(events.p4, parent).sum())
+        weight_sum += float(events.weights.sum())
+    elapsed = time.perf_counter() - t0
+    return {
+        "events": n_events,
+        "events_per_s": n_events / elapsed,
+        "on_shell_fraction": n_ok / n_events,
+        "conserved_fraction": n_conserved / n_events,
+        "mean_weight": weight_sum / n_events,
+    }
+
+
+if __name__ == "__main__":
+    for key, value in benchmark().items():
+        print(f"{key:>18}: {value:.4g}")
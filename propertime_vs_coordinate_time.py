@@ -1,6 +1,9 @@
 import streamlit as st
 import numpy as np
+from lorentz_kernel import gamma as lorentz_gamma
 import matplotlib.pyplot as plt
+from minkowski_layers import load_events
+from worldlines import HyperbolicWorldline, adaptive_proper_time, tabulated_proper_time
 
 # Streamlit setup
 st.set_page_config(page_title="Proper Time vs Coordinate Time", layout="centered")
@@ -16,7 +19,7 @@ v = st.slider("Traveler's speed (as a fraction of c)", min_value=0.0, max_value=
 t_max = st.slider("Total coordinate time on Earth (in arbitrary units)", min_value=1, max_value=20, value=10)
 
 # Calculations
-gamma = 1 / np.sqrt(1 - v**2)
+gamma = lorentz_gamma(v)
 t_vals = np.linspace(0, t_max, 300)
 tau_vals = t_vals / gamma  # Proper time for moving observer
 
@@ -62,6 +65,69 @@ st.latex(rf"""
 \tau = \frac{{t}}{{\gamma}} = \frac{{{t_max}}}{{{gamma:.6f}}} = {t_max / gamma:.6f}
 """)
 
+# --- Accelerated and tabulated worldlines ---
+st.subheader("🚀 Accelerated Traveler")
+st.markdown("""
+Real journeys do not hold one speed. Here the traveler leaves from rest with constant proper acceleration $g$, coasts,
+then brakes with $-g$ to a stop. Each leg is hyperbolic motion, solved in closed form:
+""")
+st.latex(r"""
+\sinh\eta = \sinh\eta_0 + g\,\Delta t, \qquad \Delta\tau = \frac{\eta - \eta_0}{g}
+""")
+acc_col1, acc_col2 = st.columns(2)
+with acc_col1:
+    g_acc = st.slider("Proper acceleration g (c = 1 units)", 0.05, 2.0, 0.5, 0.05)
+with acc_col2:
+    burn = st.slider("Burn time per phase (coordinate time)", 0.0, float(t_max) / 2, float(t_max) / 4, 0.1)
+coast = t_max - 2 * burn
+ship = HyperbolicWorldline([g_acc, 0.0, -g_acc], [burn, coast, burn])
+x_acc, v_acc, tau_acc = ship.evaluate(t_vals)
+check = adaptive_proper_time(ship.position, 0.0, float(t_max), tol=1e-9)
+
+fig3, (ax3, ax4) = plt.subplots(1, 2, figsize=(10, 4))
+ax3.plot(t_vals, tau_acc, color="darkorange", label="Accelerated traveler")
+ax3.plot(t_vals, tau_vals, color="purple", linestyle=":", label=f"Constant v = {v:.2f}")
+ax3.plot(t_vals, t_vals, linestyle="--", color="gray", label="$t$ (Earth)")
+ax3.set_xlabel("Coordinate Time $t$")
+ax3.set_ylabel("Proper Time $\\tau$")
+ax3.legend()
+ax3.grid(True)
+ax4.plot(x_acc, t_vals, color="darkorange", label="Traveler")
+ax4.plot([0, 0], [0, t_max], color="blue", label="Earth")
+ax4.set_xlabel("x")
+ax4.set_ylabel("t")
+ax4.set_title("Worldline")
+ax4.legend()
+ax4.grid(True)
+st.pyplot(fig3)
+plt.close(fig3)
+st.markdown(f"""
+- Top speed: $v = {v_acc.max():.4f}$ after each burn
+- Traveler's proper time: $\\tau = {float(ship.tau_end):.6f}$ (closed form)
+- Adaptive numerical check: $\\tau = {check.tau[-1]:.6f}$ from {len(check.t):,} samples, estimated error {check.error:.1e}
+""")
+
+st.subheader("📄 Your Own Worldline")
+st.markdown("Upload a CSV of samples $(t, x)$ in $c = 1$ units, header optional; proper time is summed along the chords between samples.")
+worldline_file = st.file_uploader("Worldline CSV", type=["csv"])
+if worldline_file is not None:
+    try:
+        samples = load_events(worldline_file)
+        own = tabulated_proper_time(samples.t, samples.x)
+    except ValueError as exc:
+        st.error(f"Could not integrate this worldline: {exc}")
+    else:
+        fig5, ax5 = plt.subplots(figsize=(6, 4))
+        ax5.plot(own.t, own.tau, color="teal", label="Proper time")
+        ax5.plot(own.t, own.t - own.t[0], linestyle="--", color="gray", label="Coordinate time")
+        ax5.set_xlabel("$t$")
+        ax5.set_ylabel("$\\tau$")
+        ax5.legend()
+        ax5.grid(True)
+        st.pyplot(fig5)
+        plt.close(fig5)
+        st.caption(f"{len(own.t):,} samples: τ = {own.tau[-1]:.6f}, estimated error {float(own.error):.1e}.")
+
 st.markdown("""
 <hr style='margin-top: 50px; margin-bottom: 10px'>
 
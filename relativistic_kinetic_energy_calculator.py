@@ -1,5 +1,6 @@
 import streamlit as st
 import numpy as np
+from lorentz_kernel import lorentz_factors
 import pandas as pd
 import matplotlib.pyplot as plt
 
@@ -20,10 +21,8 @@ mass = st.number_input("Enter rest mass \( m \):", min_value=0.0, value=1.0, ste
 
 # --- Speed values ---
 v_vals = np.linspace(0, 0.999, 400)
-gamma_vals = 1 / np.sqrt(1 - v_vals**2)
-
 # --- Energy calculations ---
-ke_rel = (gamma_vals - 1) * mass
+ke_rel = lorentz_factors(v_vals).gamma_minus_one * mass  # γ − 1 without cancellation at low v
 ke_newton = 0.5 * mass * v_vals**2
 
 # --- Deviation threshold ---
@@ -52,8 +51,7 @@ st.pyplot(fig)
 st.subheader("📊 KE Comparison Table")
 
 v_sample = np.linspace(0.1, 0.99, 10)
-gamma_sample = 1 / np.sqrt(1 - v_sample**2)
-ke_rel_sample = (gamma_sample - 1) * mass
+ke_rel_sample = lorentz_factors(v_sample).gamma_minus_one * mass
 ke_newton_sample = 0.5 * mass * v_sample**2
 diff_pct_sample = 100 * (ke_rel_sample - ke_newton_sample) / ke_rel_sample
 
@@ -1,5 +1,6 @@
 import streamlit as st
 import numpy as np
+from lorentz_kernel import gamma as lorentz_gamma
 import matplotlib.pyplot as plt
 
 # Streamlit page setup
@@ -17,7 +18,7 @@ mass = st.number_input("Enter rest mass \( m \) (arbitrary units):", min_value=0
 velocity = st.number_input("Enter velocity \( v \) (as a fraction of \( c \)):", min_value=0.0, max_value=0.999999, value=0.7, step=0.01, format="%.6f")
 
 # Compute gamma and momenta
-gamma = 1 / np.sqrt(1 - velocity**2)
+gamma = lorentz_gamma(velocity)
 p_rel = gamma * mass * velocity
 p_newton = mass * velocity
 
@@ -37,7 +38,7 @@ p_{{\text{{Newton}}}} = mv = {mass} \times {velocity} = {p_newton:.6f}
 st.subheader("📈 Relativistic vs Newtonian Momentum")
 
 v_vals = np.linspace(0, 0.999, 300)
-gamma_vals = 1 / np.sqrt(1 - v_vals**2)
+gamma_vals = lorentz_gamma(v_vals)
 p_rel_vals = gamma_vals * mass * v_vals
 p_newton_vals = mass * v_vals
 
@@ -0,0 +1,229 @@
+import time
+from collections import namedtuple
+
+import numpy as np
+from scipy.interpolate import CubicSpline
+
+from field_boost import boost_fields
+from lorentz_transform import LorentzTransform
+
+# Gaussian units with c = 1: a charge q at rest has E = q r̂ / r². Points
+# and positions are (..., 3) arrays. A trajectory is any object with
+# position(t), velocity(t) and acceleration(t) vectorised over an array of
+# times, plus max_speed < 1 and t_min (the earliest time it is defined).
+
+FIELD_POINT_CHUNK = 1 << 16  # observation points per chunk
+
+RetardedFields = namedtuple("RetardedFields", ["E", "B", "iterations"])
+
+
+class UniformMotion:
+    """x(t) = x0 + v·t."""
+
+    t_min = -np.inf
+
+    def __init__(self, x0, v):
+        self.x0 = np.asarray(x0, dtype=float)
+        self.v = np.asarray(v, dtype=float)
+        self.max_speed = float(np.linalg.norm(self.v))
+        if self.max_speed >= 1:
+            raise ValueError("Speed must be below c = 1.")
+
+    def position(self, t):
+        return self.x0 + np.multiply.outer(t, self.v)
+
+    def velocity(self, t):
+        return np.broadcast_to(self.v, np.shape(t) + (3,))
+
+    def acceleration(self, t):
+        return np.zeros(np.shape(t) + (3,))
+
+
+class CircularMotion:
+    """Circle of `radius` in the z = const plane through `center`, at angular speed omega."""
+
+    t_min = -np.inf
+
+    def __init__(self, radius, omega, center=(0.0, 0.0, 0.0), phase=0.0):
+        self.radius, self.omega, self.phase = float(radius), float(omega), float(phase)
+        self.center = np.asarray(center, dtype=float)
+        self.max_speed = abs(self.radius * self.omega)
+        if self.max_speed >= 1:
+            raise ValueError("radius·omega must be below c = 1.")
+
+    def _angle(self, t):
+        return self.omega * np.asarray(t) + self.phase
+
+    def position(self, t):
+        a = self._angle(t)
+        return self.center + self.radius * np.stack([np.cos(a), np.sin(a), np.zeros_like(a)], axis=-1)
+
+    def velocity(self, t):
+        a = self._angle(t)
+        return self.radius * self.omega * np.stack([-np.sin(a), np.cos(a), np.zeros_like(a)], axis=-1)
+
+    def acceleration(self, t):
+        a = self._angle(t)
+        return -self.radius * self.omega ** 2 * np.stack([np.cos(a), np.sin(a), np.zeros_like(a)], axis=-1)
+
+
+class TabulatedMotion:
+    """Positions sampled at increasing times, interpolated by a cubic spline.
+
+    Fields at points whose retarded time falls before the first sample are NaN.
+    """
+
+    def __init__(self, t, x):
+        t, x = np.asarray(t, dtype=float), np.asarray(x, dtype=float)
+        if x.shape != (len(t), 3):
+            raise ValueError("Positions must have shape (len(t), 3).")
+        self._spline = CubicSpline(t, x, axis=0)
+        self._v = self._spline.derivative(1)
+        self._a = self._spline.derivative(2)
+        self.t_min = t[0]
+        fine = np.linspace(t[0], t[-1], 8 * len(t))
+        self.max_speed = float(np.linalg.norm(self._v(fine), axis=-1).max())
+        if self.max_speed >= 1:
+            raise ValueError("The tabulated trajectory moves faster than c = 1.")
+
+    def position(self, t):
+        return self._spline(t)
+
+    def velocity(self, t):
+        return self._v(t)
+
+    def acceleration(self, t):
+        return self._a(t)
+
+
+def retarded_time(points, t, trajectory, tol=1e-12, max_iter=60):
+    """Solve t − t′ = |r − x(t′)| for every observation point, vectorised.
+
+    f(t′) = t − t′ − |r − x(t′)| decreases strictly for |v| < 1, so the root is
+    bracketed by [t − D, t] with D = |r − x(t)| / (1 − max_speed). Newton steps
+    that leave the bracket fall back to bisection. Returns (t′, iterations);
+    t′ is NaN where the bracket starts before trajectory.t_min and f > 0 there.
+    """
+    points = np.asarray(points, dtype=float)
+    d_now = np.linalg.norm(points - trajectory.position(np.full(len(points), t)), axis=-1)
+    lo = t - d_now / (1 - trajectory.max_speed)
+    hi = np.full(len(points), float(t))
+    valid = np.ones(len(points), dtype=bool)
+    if np.isfinite(trajectory.t_min):
+        lo = np.maximum(lo, trajectory.t_min)
+        valid = t - lo - np.linalg.norm(points - trajectory.position(lo), axis=-1) >= 0
+    tr = np.clip(t - d_now, lo, hi)
+    active = np.flatnonzero(valid)
+    scale = np.maximum(d_now, 1.0)
+    iterations = 0
+    while active.size and iterations < max_iter:
+        iterations += 1
+        ta = tr[active]
+        sep = points[active] - trajectory.position(ta)
+        dist = np.linalg.norm(sep, axis=-1)
+        f = t - ta - dist
+        n_dot_v = np.einsum("ij,ij->i", sep, trajectory.velocity(ta)) / np.maximum(dist, 1e-300)
+        done = np.abs(f) <= tol * scale[active]
+        above = f > 0  # the root is later than ta
+        lo[active] = np.where(above, ta, lo[active])
+        hi[active] = np.where(above, hi[active], ta)
+        step = ta + f / (1 - n_dot_v)  # Newton: f′ = −1 + n·v
+        inside = (step > lo[active]) & (step < hi[active])
+        tr[active] = np.where(done, ta, np.where(inside, step, 0.5 * (lo[active] + hi[active])))
+        active = active[~done]
+    tr[~valid] = np.nan
+    return tr, iterations
+
+
+def _lw_fields(points, t_ret, q, trajectory, min_distance):
+    """Liénard–Wiechert E and B at points given the retarded times."""
+    sep = points - trajectory.position(t_ret)
+    R = np.maximum(np.linalg.norm(sep, axis=-1), min_distance)
+    n = sep / R[:, None]
+    beta = trajectory.velocity(t_ret)
+    accel = trajectory.acceleration(t_ret)
+    kappa = 1 - np.einsum("ij,ij->i", n, beta)
+    n_minus_beta = n - beta
+    velocity_term = n_minus_beta * ((1 - np.einsum("ij,ij->i", beta, beta)) / (kappa ** 3 * R ** 2))[:, None]
+    radiation_term = np.cross(n, np.cross(n_minus_beta, accel)) / (kappa ** 3 * R)[:, None]
+    E = q * (velocity_term + radiation_term)
+    return E, np.cross(n, E)
+
+
+def lienard_wiechert(points, t, charges, chunk=FIELD_POINT_CHUNK, tol=1e-12, max_iter=60, min_distance=1e-6):
+    """Retarded E and B of point charges at observation points (..., 3) at time t.
+
+    charges is a list of (q, trajectory). Points are processed in chunks, so
+    a 512 × 512 map of many charges holds one chunk of temporaries at a time;
+    the fields of every charge are summed into the output. Returns
+    RetardedFields with the largest number of root-finding iterations used.
+    """
+    points = np.asarray(points, dtype=float)
+    flat = points.reshape(-1, 3)
+    E = np.zeros(flat.shape)
+    B = np.zeros(flat.shape)
+    worst = 0
+    for start in range(0, len(flat), chunk):
+        sl = slice(start, start + chunk)
+        for q, trajectory in charges:
+            t_ret, its = retarded_time(flat[sl], t, trajectory, tol, max_iter)
+            e, b = _lw_fields(flat[sl], t_ret, q, trajectory, min_distance)
+            E[sl] += e
+            B[sl] += b
+            worst = max(worst, its)
+    return RetardedFields(E.reshape(points.shape), B.reshape(points.shape), worst)
+
+
+def boosted_coulomb(points, t, q, motion):
+    """Fields of a uniformly moving charge from its rest-frame Coulomb field.
+
+    Each observation event (t, r) is taken into the charge's rest frame,
+    where E′ = q r′/|r′|³ and B′ = 0, and the fields are boosted back with
+    field_boost.boost_fields — the field tensor route of the transformer page.
+    """
+    points = np.asarray(points, dtype=float)
+    flat = points.reshape(-1, 3)
+    events = np.column_stack([np.full(len(flat), float(t)), flat - motion.x0])
+    rest = LorentzTransform.boost(motion.v).apply(events)[:, 1:]
+    E_rest = q * rest / np.linalg.norm(rest, axis=-1, keepdims=True) ** 3
+    res = boost_fields(E_rest, np.zeros_like(E_rest), -motion.v, with_invariants=False)
+    return res.E.reshape(points.shape), res.B.reshape(points.shape)
+
+
+def plane_grid(extent, n, z=0.0):
+    """(n, n, 3) observation points on the square [−extent, extent]² at height z."""
+    axis = np.linspace(-extent, extent, n)
+    X, Y = np.meshgrid(axis, axis, indexing="xy")
+    return np.stack([X, Y, np.full_like(X, z)], axis=-1)
+
+
+def benchmark(n=512, n_charges=4, seed=0):
+    """A 512 × 512 map of charges on circular orbits at β = 0.8, and a uniform-motion check at β = 0.8."""
+    rng = np.random.default_rng(seed)
+    points = plane_grid(4.0, n, z=0.05)
+    radii = rng.uniform(0.3, 1.0, n_charges)
+    charges = [(1.0, CircularMotion(r, 0.8 / r, center=(*rng.uniform(-1, 1, 2), 0.0), phase=rng.uniform(0, 2 * np.pi)))
+               for r in radii]
+    t0 = time.perf_counter()
+    res = lienard_wiechert(points, 3.0, charges)
+    elapsed = time.perf_counter() - t0
+
+    motion = UniformMotion([-1.0, 0.2, 0.0], [0.8, 0.0, 0.0])
+    check = plane_grid(4.0, 128, z=0.3)
+    lw = lienard_wiechert(check, 2.0, [(1.0, motion)])
+    E_ref, B_ref = boosted_coulomb(check, 2.0, 1.0, motion)
+    rel = np.linalg.norm(lw.E - E_ref, axis=-1) / np.linalg.norm(E_ref, axis=-1)
+    return {
+        "points": n * n,
+        "charges": n_charges,
+        "seconds": elapsed,
+        "point_charges_per_s": n * n * n_charges / elapsed,
+        "max_iterations": res.iterations,
+        "uniform_max_rel_error": rel.max(),
+        "uniform_max_B_error": np.abs(lw.B - B_ref).max() / np.abs(B_ref).max(),
+    }
+
+
+if __name__ == "__main__":
+    for key, value in benchmark().items():
+        print(f"{key:>22}: {value:.4g}")
@@ -0,0 +1,160 @@
+import heapq
+import time
+from collections import namedtuple
+
+import numpy as np
+
+# Events are (t, x) with c = 1. In a frame moving at v along x the time order
+# of events is the order of t − v·x (γ > 0 drops out), so every event is a
+# line in v and two events swap order exactly where their lines cross,
+# v* = Δt / Δx, which lies inside (−1, 1) only for spacelike pairs.
+
+FlipSequence = namedtuple("FlipSequence", ["initial_order", "v", "earlier", "later", "position"])
+
+
+def critical_velocity(tA, xA, tB, xB):
+    """Velocity at which two events are simultaneous; None if they are not spacelike separated."""
+    dt, dx = tB - tA, xB - xA
+    if abs(dt) >= abs(dx):
+        return None
+    return dt / dx
+
+
+def order_at(t, x, v, side="after"):
+    """Indices of the events sorted by time in the frame moving at v.
+
+    Events simultaneous at v are ordered as they are just after v (larger
+    x first) or, with side="before", just before it; then by index.
+    """
+    t, x = np.asarray(t, dtype=float), np.asarray(x, dtype=float)
+    tie = -x if side == "after" else x
+    return np.lexsort((np.arange(len(t)), tie, t - v * x))
+
+
+def count_flips(t, x, v_min=-1.0, v_max=1.0):
+    """Number of pairs whose order reverses between v_min and v_max, in O(N log N).
+
+    It is the inversion count of the order just before v_max relative to
+    the order just after v_min, computed with a Fenwick tree.
+    """
+    start = order_at(t, x, v_min)
+    rank = np.empty(len(start), dtype=np.int64)
+    rank[start] = np.arange(len(start))
+    seq = rank[order_at(t, x, v_max, side="before")]
+    tree = [0] * (len(seq) + 1)
+    inversions = 0
+    for seen, r in enumerate(seq.tolist()):
+        i, smaller = r + 1, 0
+        while i > 0:
+            smaller += tree[i]
+            i -= i & -i
+        inversions += seen - smaller
+        i = r + 1
+        while i <= len(seq):
+            tree[i] += 1
+            i += i & -i
+    return inversions
+
+
+def critical_velocities(t, x, chunk=2048):
+    """Yield (i, j, v*) arrays for every spacelike pair, i < j, in row chunks.
+
+    Vectorised but O(N²): use it for histograms of flip velocities, and
+    sweep() when the order of the flips matters.
+    """
+    t, x = np.asarray(t, dtype=float), np.asarray(x, dtype=float)
+    n = len(t)
+    for start in range(0, n, chunk):
+        rows = np.arange(start, min(start + chunk, n))
+        dt = t[None, :] - t[rows, None]
+        dx = x[None, :] - x[rows, None]
+        mask = (np.abs(dt) < np.abs(dx)) & (np.arange(n)[None, :] > rows[:, None])
+        i, j = np.nonzero(mask)
+        yield rows[i], j, dt[i, j] / dx[i, j]
+
+
+def sweep(t, x, v_min=-1.0, v_max=1.0):
+    """Kinetic sweep over v: yield (v*, earlier, later, position) for every order flip, in v order.
+
+    Covers the open interval (v_min, v_max), so lightlike pairs (v* = ±1)
+    never flip. Starts from the time order just above v_min and keeps only adjacent
+    pairs' crossing velocities in a heap, so each flip costs O(log N)
+    instead of a re-sort. `earlier` was before `later` until v*; `position`
+    is the index in the ordering where the swap happens. Applying the flips
+    in turn to order_at(t, x, v_min) reproduces the order at every v.
+    """
+    t, x = np.asarray(t, dtype=float), np.asarray(x, dtype=float)
+    order = order_at(t, x, v_min).tolist()
+    tl, xl = t.tolist(), x.tolist()
+    heap = []
+
+    def push(pos, v_now):
+        a, b = order[pos], order[pos + 1]
+        # b overtakes a only if it lies further along x.
+        if xl[a] < xl[b]:
+            v_cross = (tl[a] - tl[b]) / (xl[a] - xl[b])
+            if v_cross < v_max:
+                heapq.heappush(heap, (max(v_cross, v_now), pos, a, b))
+
+    for pos in range(len(order) - 1):
+        push(pos, v_min)
+    while heap:
+        v_cross, pos, a, b = heapq.heappop(heap)
+        if order[pos] != a or order[pos + 1] != b:
+            continue  # stale: one of the two has moved since this entry was pushed
+        order[pos], order[pos + 1] = b, a
+        yield v_cross, a, b, pos
+        if pos > 0:
+            push(pos - 1, v_cross)
+        if pos + 2 < len(order):
+            push(pos + 1, v_cross)
+
+
+def flip_sequence(t, x, v_min=-1.0, v_max=1.0, max_flips=None):
+    """Collect sweep() into arrays: the initial order plus every flip, in v order.
+
+    Raises ValueError if there would be more than max_flips flips; check
+    count_flips first for large event sets.
+    """
+    if max_flips is not None:
+        n_flips = count_flips(t, x, v_min, v_max)
+        if n_flips > max_flips:
+            raise ValueError(f"{n_flips:,} flips exceed max_flips={max_flips:,}.")
+    flips = list(sweep(t, x, v_min, v_max))
+    v, earlier, later, position = (np.array(col) for col in zip(*flips)) if flips else (np.array([]),) * 4
+    return FlipSequence(order_at(t, x, v_min), v, earlier.astype(int), later.astype(int), position.astype(int))
+
+
+def benchmark(n_events=20_000, n_checks=5, seed=0):
+    """Sweep a random event cloud and check the tracked order against argsort at sampled v.
+
+    The cloud is long in t so that a few percent of pairs are spacelike,
+    giving a few million flips.
+    """
+    rng = np.random.default_rng(seed)
+    t = rng.uniform(0, 2000, n_events)
+    x = rng.uniform(0, 50, n_events)
+    checks = np.sort(rng.uniform(-1, 1, n_checks))
+
+    t0 = time.perf_counter()
+    order = order_at(t, x, -1.0)
+    n_flips, mismatches, k = 0, 0, 0
+    for v_cross, a, b, pos in sweep(t, x):
+        while k < n_checks and checks[k] < v_cross:
+            mismatches += int(np.any(order != order_at(t, x, checks[k])))
+            k += 1
+        order[pos], order[pos + 1] = b, a
+        n_flips += 1
+    elapsed = time.perf_counter() - t0
+
+    return {
+        "flips": n_flips,
+        "expected_flips": count_flips(t, x),
+        "flips_per_s": n_flips / elapsed,
+        "order_mismatches": mismatches,
+    }
+
+
+if __name__ == "__main__":
+    for key, value in benchmark().items():
+        print(f"{key:>16}: {value:.4g}")
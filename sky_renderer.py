@@ -0,0 +1,220 @@
+import time
+from functools import lru_cache
+
+import numpy as np
+
+from lorentz_kernel import lorentz_factors
+
+# Nominal wavelengths (nm) at which the R, G and B channels sample a spectrum.
+CHANNEL_NM = np.array([610.0, 550.0, 465.0])
+VISIBLE_NM = (380.0, 750.0)
+LUT_SIZE = 1 << 14  # Doppler factors tabulated for the colour shift and beaming
+
+
+def equirect_directions(height, width):
+    """Unit view directions (H, W, 3) for an equirectangular grid; longitude spans the width."""
+    lat = np.pi / 2 - (np.arange(height) + 0.5) * np.pi / height
+    lon = -np.pi + (np.arange(width) + 0.5) * 2 * np.pi / width
+    cl = np.cos(lat)[:, None]
+    return np.stack(np.broadcast_arrays(cl * np.cos(lon), cl * np.sin(lon), np.sin(lat)[:, None]), axis=-1)
+
+
+def inverse_aberration(directions, beta):
+    """Rest-frame source directions and Doppler factors for observed directions.
+
+    directions: (..., 3) unit vectors seen by an observer moving with
+    velocity beta (3-vector). Returns the direction each ray came from in the
+    rest frame of the sky, and D = ν_obs / ν_rest = 1 / (γ (1 − β cos θ')).
+    """
+    beta = np.asarray(beta, dtype=float)
+    speed = np.linalg.norm(beta)
+    if speed == 0:
+        return directions, np.ones(directions.shape[:-1])
+    f = lorentz_factors(speed)
+    g, d = float(f.gamma), 1 - speed
+    b_hat = beta / speed
+    cos_obs = directions @ b_hat
+    # 1 − β cos θ' written around d = 1 − β to avoid cancellation.
+    one_minus = d + speed * (1 - cos_obs)
+    cos_rest = (cos_obs - speed) / one_minus
+    perp = directions - cos_obs[..., None] * b_hat
+    rest = cos_rest[..., None] * b_hat + perp / (g * one_minus)[..., None]
+    return rest, 1 / (g * one_minus)
+
+
+def _colour_mix(doppler, beaming):
+    """Per-pixel 3×3 matrices mapping rest-frame RGB to observed RGB.
+
+    The rest spectrum is taken as piecewise linear through the three
+    channel wavelengths and zero outside the visible band; observed channel
+    c at λ_c receives rest-frame light from D·λ_c.
+    """
+    order = np.argsort(CHANNEL_NM)  # B, G, R by wavelength
+    nm = CHANNEL_NM[order]
+    knots = np.concatenate([[VISIBLE_NM[0]], nm, [VISIBLE_NM[1]]])
+    lam = doppler[..., None] * CHANNEL_NM  # (..., 3) rest wavelengths sampled
+    idx = np.clip(np.searchsorted(knots, lam) - 1, 0, len(knots) - 2)
+    frac = (lam - knots[idx]) / (knots[idx + 1] - knots[idx])
+    inside = (lam >= VISIBLE_NM[0]) & (lam <= VISIBLE_NM[1])
+
+    mix = np.zeros(doppler.shape + (3, 3), dtype=np.float32)
+    for knot, weight in ((idx, 1 - frac), (idx + 1, frac)):
+        # Knots 1..3 are the sorted channels; the band edges (0 and 4) carry zero.
+        valid = inside & (knot >= 1) & (knot <= 3)
+        src = order[np.clip(knot - 1, 0, 2)]
+        w = np.where(valid, weight, 0.0)
+        mix += w[..., :, None] * (src[..., :, None] == np.arange(3))
+
+    mix *= _beaming_factor(doppler, beaming)[..., None, None]
+    return mix
+
+
+def _beaming_factor(doppler, beaming):
+    if beaming == "specific":
+        return doppler**3
+    if beaming == "bolometric":
+        return doppler**4
+    return np.ones_like(doppler)
+
+
+@lru_cache(maxsize=8)  # a full-HD entry is ~25 MB
+def sky_coordinates(beta, in_shape, out_shape):
+    """Source pixel coordinates and Doppler factor of every output pixel, for one velocity.
+
+    beta is a tuple so the result can be cached. Returns float32 (u, v, D):
+    the continuous column and row in the panorama (pixel centres at
+    integer + 0.5) and ν_obs / ν_rest. Everything else is derived per
+    frame, so a cached velocity costs only the gather and the colour mix.
+    """
+    h_in, w_in = in_shape
+    rest, doppler = inverse_aberration(equirect_directions(*out_shape), np.array(beta))
+    lon = np.arctan2(rest[..., 1], rest[..., 0])
+    lat = np.arcsin(np.clip(rest[..., 2], -1, 1))
+    u = ((lon + np.pi) / (2 * np.pi) * w_in - 0.5).astype(np.float32)
+    v = ((np.pi / 2 - lat) / np.pi * h_in - 0.5).astype(np.float32)
+    doppler = doppler.astype(np.float32)
+    for arr in (u, v, doppler):
+        arr.setflags(write=False)
+    return u, v, doppler
+
+
+@lru_cache(maxsize=32)
+def colour_table(speed, beaming="specific", colour_shift=True, size=LUT_SIZE):
+    """Colour scaling on a log-spaced grid of Doppler factors, for observer speed `speed`.
+
+    The grid spans the whole sky, D from √((1 − β)/(1 + β)) to
+    √((1 + β)/(1 − β)). Entries are 3×3 colour matrices when colour_shift
+    is on, otherwise intensity factors. Returns (log D of the first entry,
+    step in log D, table).
+    """
+    half_range = np.arctanh(speed)  # log D runs over ±η
+    grid = np.exp(np.linspace(-half_range, half_range, size))
+    if colour_shift:
+        table = _colour_mix(grid, beaming)
+    else:
+        table = _beaming_factor(grid, beaming).astype(np.float32)
+    table.setflags(write=False)
+    step = 2 * half_range / (size - 1) if half_range > 0 else 1.0
+    return -half_range, step, table
+
+
+def render_sky(panorama, beta, out_shape=None, beaming="specific", colour_shift=True,
+               exposure=1.0, interpolation="bilinear"):
+    """Render what an observer moving with velocity beta sees of an equirectangular panorama.
+
+    panorama: (H, W, 3) array, uint8 or float in [0, 1], in the sky's rest
+    frame. beaming is "specific" (I_ν ∝ D³), "bolometric" (∝ D⁴) or None.
+    interpolation is "bilinear" or the faster "nearest".
+    Returns a float32 (H', W', 3) image clipped to [0, 1] and the Doppler map.
+    """
+    img = np.asarray(panorama)
+    if img.dtype == np.uint8:
+        img = img.astype(np.float32) / 255
+    img = img[..., :3].astype(np.float32, copy=False)
+    h_in, w_in = img.shape[:2]
+    out_shape = tuple(out_shape or img.shape[:2])
+    key = tuple(float(b) for b in np.round(np.asarray(beta, dtype=float), 9))
+
+    u, v, doppler = sky_coordinates(key, (h_in, w_in), out_shape)
+    flat = img.reshape(-1, 3)
+    if interpolation == "nearest":
+        rows = np.clip(np.rint(v).astype(np.int32), 0, h_in - 1)
+        out = np.take(flat, rows * w_in + np.mod(np.rint(u).astype(np.int32), w_in), axis=0)
+    else:
+        u0, v0 = np.floor(u), np.floor(v)
+        fu, fv = u - u0, v - v0
+        u0, v0 = u0.astype(np.int32), v0.astype(np.int32)
+        out = np.zeros(out_shape + (3,), dtype=np.float32)
+        for dv, wv in ((0, 1 - fv), (1, fv)):
+            rows = np.clip(v0 + dv, 0, h_in - 1) * w_in
+            for du, wu in ((0, 1 - fu), (1, fu)):
+                cols = np.mod(u0 + du, w_in)  # longitude wraps
+                out += (wv * wu)[..., None] * np.take(flat, rows + cols, axis=0)
+
+    lo, step, table = colour_table(round(float(np.linalg.norm(key)), 9), beaming, colour_shift)
+    bins = np.clip(np.rint((np.log(doppler) - lo) / step).astype(np.int32), 0, len(table) - 1)
+    if colour_shift:
+        mixed = np.empty_like(out)
+        for i in range(3):
+            mixed[..., i] = sum(table[:, i, j][bins] * out[..., j] for j in range(3))
+        out = mixed
+    else:
+        out *= table[bins][..., None]
+    return np.clip(out * exposure, 0, 1), doppler
+
+
+def synthetic_panorama(height=512, width=1024, n_stars=4000, seed=0):
+    """Star field with a faint coordinate grid, for when no panorama is uploaded."""
+    rng = np.random.default_rng(seed)
+    img = np.zeros((height, width, 3), dtype=np.float32)
+    img[::height // 12] = 0.15
+    img[:, ::width // 24] = 0.15
+    z = rng.uniform(-1, 1, n_stars)
+    lon = rng.uniform(-np.pi, np.pi, n_stars)
+    rows = ((np.pi / 2 - np.arcsin(z)) / np.pi * height).astype(int).clip(0, height - 1)
+    cols = ((lon + np.pi) / (2 * np.pi) * width).astype(int).clip(0, width - 1)
+    temp = rng.uniform(0, 1, n_stars)  # 0 = red, 1 = blue
+    colour = np.stack([1 - 0.5 * temp, 0.8 + 0 * temp, 0.5 + 0.5 * temp], axis=-1)
+    img[rows, cols] = colour * rng.uniform(0.4, 1, (n_stars, 1))
+    return img
+
+
+def benchmark(beta=0.8, out_shape=(1080, 1920), preview_shape=(480, 960)):
+    """Check the Doppler map against D = 1 / (γ (1 − β cos θ')) at a few angles, then time renders.
+
+    Also checks the equivalent rest-frame form γ (1 + β cos θ). Times a
+    full-size render and the page's display-size preview.
+    """
+    cos_obs = np.array([1.0, 0.5, 0.0, -0.5, -1.0])
+    directions = np.stack([cos_obs, np.sqrt(1 - cos_obs ** 2), np.zeros_like(cos_obs)], axis=-1)
+    rest, doppler = inverse_aberration(directions, [beta, 0.0, 0.0])
+    g = 1 / np.sqrt(1 - beta ** 2)
+    textbook = 1 / (g * (1 - beta * cos_obs))
+    rest_form = g * (1 + beta * rest[:, 0])
+    pano = synthetic_panorama()
+    t0 = time.perf_counter()
+    render_sky(pano, (beta, 0.0, 0.0), out_shape=out_shape)
+    first = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    render_sky(pano, (beta, 0.0, 0.0), out_shape=out_shape)
+    repeat = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    render_sky(pano, (beta + 0.01, 0.0, 0.0), out_shape=preview_shape)
+    preview_first = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    render_sky(pano, (beta + 0.01, 0.0, 0.0), out_shape=preview_shape)
+    preview_repeat = time.perf_counter() - t0
+    return {
+        "doppler_max_error": np.abs(doppler - textbook).max(),
+        "rest_form_max_error": np.abs(doppler - rest_form).max(),
+        "doppler_at_90deg": doppler[2],
+        "new_beta_s": first,
+        "cached_beta_s": repeat,
+        "preview_new_beta_s": preview_first,
+        "preview_cached_beta_s": preview_repeat,
+    }
+
+
+if __name__ == "__main__":
+    for key, value in benchmark().items():
+        print(f"{key:>21}: {value:.4g}")
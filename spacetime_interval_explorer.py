@@ -1,5 +1,11 @@
 import streamlit as st
 import numpy as np
+import pandas as pd
+from causal_index import (LABELS, LIGHTLIKE, TIMELIKE, CausalIndex, classify_intervals, classify_pairs,
+                          synthetic_log)
+from causal_graph import CausalGraph, sprinkle
+from minkowski_layers import load_events
+import matplotlib.pyplot as plt
 
 # --- Constants ---
 c = 3e8  # Speed of light in m/s
@@ -42,6 +48,10 @@ with col2:
     y2 = st.number_input("y₂ (m)", value=0.0, key="y2")
     z2 = st.number_input("z₂ (m)", value=0.0, key="z2")
 
+null_tol = st.number_input("Null tolerance (relative to c²Δt² + |Δr|²)", min_value=0.0, max_value=1e-2,
+                           value=1e-9, step=1e-9, format="%.1e",
+                           help="Intervals with |s²| below this fraction of the separation count as light-like.")
+
 # --- Compute and Classify ---
 if st.button("🔍 Check Spacetime Interval"):
     dt = t2 - t1
@@ -55,15 +65,129 @@ if st.button("🔍 Check Spacetime Interval"):
     st.latex(r"s^2 = c^2 (\Delta t)^2 - (\Delta x)^2 - (\Delta y)^2 - (\Delta z)^2")
     st.latex(f"s^2 = {s_squared:.4e} \, \text{{m}}^2")
 
-    if np.isclose(s_squared, 0.0, atol=1e-8):
+    label = classify_intervals(dt, dx**2 + dy**2 + dz**2, c, null_tol)[0]
+    if label == LIGHTLIKE:
         st.success("This is a **light-like (null)** interval.")
-    elif s_squared > 0:
+    elif label == TIMELIKE:
         st.info("This is a **time-like** interval.")
     else:
         st.warning("This is a **space-like** interval.")
 
 
 
+# --- Event Log Queries ---
+st.markdown("---")
+st.header("🗂️ Event Log: Who Can Influence Whom?")
+st.markdown("""
+Load an event log (CSV or `.npy`, columns t (s), x, y, z (m)) or use a random log of a million events spread over
+one second and a cube one light-second across. The log is indexed once — sorted by time, with a KD-tree over
+position for each block of events — so light-cone queries only touch the events light could have reached.
+""")
+
+
+@st.cache_resource(max_entries=2)
+def build_index(key, _rows):
+    return CausalIndex(_rows, c=c)
+
+
+@st.cache_data(max_entries=2)
+def read_uploaded_log(upload):
+    return np.ascontiguousarray(load_events(upload).as_rows())
+
+
+log_file = st.file_uploader("Event log", type=["csv", "npy"])
+if log_file is not None:
+    try:
+        log_rows = read_uploaded_log(log_file)
+    except (OSError, ValueError) as exc:
+        st.error(f"Could not read the event log: {exc}")
+        st.stop()
+    index = build_index(log_file.file_id, log_rows)
+else:
+    log_rows = synthetic_log()
+    index = build_index("synthetic", log_rows)
+
+q_col1, q_col2 = st.columns(2)
+with q_col1:
+    apex = st.number_input("Query event (row number)", 0, len(index) - 1, 0)
+    direction = st.radio("Light cone", ["future", "past"], horizontal=True)
+with q_col2:
+    horizon = st.number_input("Time horizon |Δt| (s, 0 = unlimited)", min_value=0.0, value=0.05, format="%.4f")
+    tau_range = st.slider("Proper-time window τ (s)", 0.0, 1.0, (0.0, 1.0), 0.005)
+
+found, labels, s2 = index.cone(int(apex), direction, horizon or None, null_tol=null_tol)
+tau = np.sqrt(np.maximum(s2, 0)) / c
+in_window = (tau >= tau_range[0]) & (tau <= tau_range[1])
+st.metric(f"Events in the {direction} light cone", f"{len(found):,}", f"{int(in_window.sum()):,} within the τ window",
+          delta_color="off")
+if in_window.any():
+    shown = np.argsort(tau[in_window])[:20]
+    st.dataframe(pd.DataFrame({
+        "row": found[in_window][shown],
+        "t (s)": log_rows[found[in_window][shown], 0],
+        "τ (s)": tau[in_window][shown],
+        "type": [LABELS[int(k)] for k in labels[in_window][shown]],
+    }), use_container_width=True)
+
+st.subheader("Batch classification of candidate pairs")
+n_pairs = st.select_slider("Random candidate pairs", [10_000, 100_000, 1_000_000], value=100_000)
+rng = np.random.default_rng(1)
+pair_i, pair_j = rng.integers(0, len(index), (2, n_pairs))
+pair_labels, _ = classify_pairs(log_rows, pair_i, pair_j, c, null_tol)
+counts = np.bincount(pair_labels.astype(np.int64) + 1, minlength=3)
+st.write(f"Time-like: **{counts[2]:,}** · Light-like: **{counts[1]:,}** · Space-like: **{counts[0]:,}**")
+
+# --- Causal Graph ---
+st.markdown("---")
+st.header("🕸️ Causal Graph and the Longest Proper-Time Path")
+st.markdown("""
+Random events are scattered between a departure event A at $(0, 0)$ and a reunion event B at $(T, 0)$.
+Each event is linked to every event in its future light cone within a time horizon, and the chain from A to B
+with the most total proper time is found by dynamic programming in time order. It approximates the inertial
+worldline — the twin who stays home ages the most. With no horizon the direct link A → B would always win.
+""")
+g_col1, g_col2 = st.columns(2)
+with g_col1:
+    n_graph = st.select_slider("Events", [1_000, 5_000, 20_000, 100_000], value=5_000)
+    duration = st.number_input("T (s)", min_value=1e-6, value=1.0)
+with g_col2:
+    horizon_frac = st.slider("Link horizon (fraction of T)", 0.02, 0.5, 0.1, 0.01)
+    weight = st.radio("Path weight", ["proper_time", "hops"], horizontal=True,
+                      format_func=lambda w: "Proper time" if w == "proper_time" else "Number of links")
+
+
+@st.cache_resource(max_entries=2)
+def causal_graph(n_graph, duration, horizon_frac):
+    events = sprinkle(n_graph, duration, 0.5 * c * duration, seed=0)
+    events[0], events[1] = (0, 0, 0, 0), (duration, 0, 0, 0)
+    return events, CausalGraph(events, horizon_frac * duration, c=c)
+
+
+try:
+    graph_events, graph = causal_graph(n_graph, duration, horizon_frac)
+except ValueError as exc:
+    st.warning(f"Too many links to build: {exc}")
+else:
+    path, total = graph.longest_path(0, 1, weight)
+    if path is None:
+        st.warning("B is not reachable from A through links this short — raise the horizon or add events.")
+    else:
+        path_tau = float(np.sum(np.sqrt(np.maximum(np.diff(graph_events[path, 0])**2 * c**2
+                                                   - np.diff(graph_events[path, 1])**2, 0))) / c)
+        st.write(f"{graph.n_edges:,} causal links. Path through **{len(path)}** events with proper time "
+                 f"**{path_tau:.6f} s** (inertial worldline: {duration:.6f} s).")
+        fig, ax = plt.subplots(figsize=(5, 5))
+        shown = graph_events[:min(len(graph_events), 5_000)]
+        ax.scatter(shown[:, 1] / c, shown[:, 0], s=2, color="lightgray", rasterized=True)
+        ax.plot(graph_events[path, 1] / c, graph_events[path, 0], "o-", color="crimson", markersize=3)
+        ax.plot([0, -0.5 * duration, 0, 0.5 * duration, 0], [0, 0.5 * duration, duration, 0.5 * duration, 0],
+                "k--", alpha=0.3, linewidth=1)
+        ax.set_xlabel("x (light-seconds)")
+        ax.set_ylabel("t (s)")
+        ax.set_aspect("equal")
+        st.pyplot(fig)
+        plt.close(fig)
+
 st.markdown("""
 <hr style='margin-top: 50px; margin-bottom: 10px'>
 
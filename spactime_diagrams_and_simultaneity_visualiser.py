@@ -1,7 +1,13 @@
 import streamlit as st
 import numpy as np
+from lorentz_kernel import gamma
+from lorentz_transform import FourVectorArray, LorentzTransform
 import pandas as pd
 import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection
+from minkowski_layers import (boost_events, draw_events, draw_static, load_events,
+                              moving_grid_segments)
+from simultaneity_sweep import critical_velocity, flip_sequence, order_at
 
 # — Page setup —
 st.set_page_config(page_title="Minkowski Diagram Generator", layout="centered")
@@ -17,17 +23,9 @@ xA, tA = st.number_input("Event A – x", 2.0), st.number_input("Event A – t",
 xB, tB = st.number_input("Event B – x", 4.0), st.number_input("Event B – t", 2.0)
 frame = st.radio("Show simultaneity in frame:", ["S (rest frame)", "S′ (moving frame)"])
 
-# — Lorentz helpers —
-def gamma(v): return 1 / np.sqrt(1 - v**2)
-def to_moving_frame(x, t, v):
-    g   = gamma(v)
-    x_p = g * (x - v * t)
-    t_p = g * (t - v * x)
-    return x_p, t_p
-
-# — Compute transformed coords —
-xA_p, tA_p = to_moving_frame(xA, tA, v)
-xB_p, tB_p = to_moving_frame(xB, tB, v)
+# — Compute transformed coords (boost along x; rows are (t, x, y, z)) —
+boost = LorentzTransform.boost([v, 0, 0])
+(tA_p, xA_p, _, _), (tB_p, xB_p, _, _) = boost.apply([[tA, xA, 0, 0], [tB, xB, 0, 0]])
 
 # — Table of event coordinates —
 df = pd.DataFrame({
@@ -40,47 +38,30 @@ df = pd.DataFrame({
 st.subheader("Event Coordinates in Each Frame")
 st.table(df)
 
+v_flip = critical_velocity(tA, xA, tB, xB)
+if v_flip is None:
+    st.info("A and B are timelike or lightlike separated: every frame agrees on their order.")
+else:
+    st.info(f"A and B are simultaneous in the frame moving at v = {v_flip:+.4f}c; "
+            "their order reverses as v crosses it.")
+
 # — Draw Minkowski diagram —
+# Light cone, S axes and S grid come from one cached raster; only the S′ layers are redrawn per velocity.
 fig, ax = plt.subplots(figsize=(6,6))
-ax.set_xlim(-5, 5)
-ax.set_ylim(-5, 5)
 ax.set_aspect('equal', 'box')
+draw_static(ax)
 ax.set_xlabel("x")
 ax.set_ylabel("ct")
 
 # Define x-array for lines
 x = np.linspace(-5, 5, 200)
 
-# Light‑cone
-ax.plot(x,  x, 'k--', alpha=0.3)
-ax.plot(x, -x, 'k--', alpha=0.3)
-
-# Rest‑frame axes (black)
-ax.axhline(0, color='black', linewidth=1)
-ax.axvline(0, color='black', linewidth=1)
-
-# Rest‑frame grid (gray)
-for t0 in np.arange(-4, 5, 1):
-    ax.plot(x, np.full_like(x, t0), color='gray', linewidth=0.5, alpha=0.2)
-for x0 in np.arange(-4, 5, 1):
-    ax.plot(np.full_like(x, x0), x, color='gray', linewidth=0.5, alpha=0.2)
-
 # Moving‑frame axes (red)
 ax.plot(x,     v * x,  color='red', linewidth=2, label="x′ axis")
 ax.plot(v * x, x,      color='red', linewidth=2, label="ct′ axis")
 
-# Moving‑frame grid (blue)
-inv_g = gamma(v)
-xp = np.arange(-5, 6, 1)
-tp = np.arange(-5, 6, 1)
-for t0p in tp:
-    xs = inv_g * (xp + v * t0p)
-    ts = inv_g * (t0p + v * xp)
-    ax.plot(xs, ts, color='blue', linewidth=0.7, alpha=0.3)
-for x0p in xp:
-    xs = inv_g * (x0p + v * tp)
-    ts = inv_g * (tp + v * x0p)
-    ax.plot(xs, ts, color='blue', linewidth=0.7, alpha=0.3)
+# Moving‑frame grid (blue), one collection
+ax.add_collection(LineCollection(moving_grid_segments(v), colors='blue', linewidths=0.7, alpha=0.3))
 
 # Plot rest‑frame events A & B
 ax.plot(xA, tA, 'go', markersize=8)
@@ -93,13 +74,111 @@ if frame == "S (rest frame)":
     ax.axhline(tA, color='green', linestyle='--', linewidth=2, label="Simultaneous in S")
     ax.fill_between(x, tA-0.02, tA+0.02, color='green', alpha=0.15)
 else:
-    t_sim = inv_g * (tA_p + v * x)
+    # t′ = γ(t − v x) held at t′_A gives t = t′_A/γ + v x, through event A.
+    t_sim = tA_p / gamma(v) + v * x
     ax.plot(x, t_sim, color='blue', linestyle='--', linewidth=2, label="Simultaneous in S′")
     ax.fill_between(x, t_sim-0.02, t_sim+0.02, color='blue', alpha=0.15)
 
 ax.legend(loc='upper left')
 ax.set_title("Minkowski Diagram (c=1 units)")
 st.pyplot(fig)
+plt.close(fig)
+
+# — Event sets from a file —
+st.subheader("📂 Event Sets")
+st.markdown("""
+Load many events at once: a CSV or `.npy` file with columns $(t, x)$ or $(t, x, y, z)$, up to millions of rows.
+A local `.npy` of shape (4, N) is memory-mapped. All events are boosted into S′ in one vectorised pass at the
+velocity above; dense clouds are drawn as a density map.
+""")
+
+
+@st.cache_data(max_entries=2)
+def read_uploaded_events(upload):
+    return load_events(upload).columns
+
+
+events_file = st.file_uploader("Event file", type=["csv", "npy"])
+events_path = st.text_input("…or path to a local .npy event file", "")
+events = None
+if events_file is not None or events_path.strip():
+    try:
+        events = (FourVectorArray(read_uploaded_events(events_file)) if events_file is not None
+                  else load_events(events_path.strip()))
+    except (OSError, ValueError) as exc:
+        st.error(f"Could not read events: {exc}")
+    else:
+        boosted = boost_events(events, v)
+        fig, (ax_s, ax_p) = plt.subplots(1, 2, figsize=(10, 5))
+        for axis, ev, title, lines in [(ax_s, events, "Events in S", True),
+                                        (ax_p, boosted, "Events in S′", False)]:
+            axis.set_aspect('equal', 'box')
+            draw_static(axis)
+            if lines:
+                axis.add_collection(LineCollection(moving_grid_segments(v), colors='blue',
+                                                   linewidths=0.7, alpha=0.3))
+            draw_events(axis, ev.x, ev.t)
+            axis.set_xlabel("x′" if not lines else "x")
+            axis.set_ylabel("ct′" if not lines else "ct")
+            axis.set_title(title)
+        st.pyplot(fig)
+        plt.close(fig)
+        st.caption(f"{len(events):,} events boosted to v = {v:+.2f}c. "
+                   "In S′ the static grid is the moving frame's own grid.")
+        preview = pd.DataFrame({"t": events.t[:10], "x": events.x[:10],
+                                "t′": boosted.t[:10], "x′": boosted.x[:10]}).round(3)
+        st.table(preview)
+
+# — Simultaneity flips —
+st.subheader("🔀 Simultaneity Flips")
+st.markdown("""
+Every spacelike pair of events swaps time order at its own critical velocity $v = \\Delta t / \\Delta x$.
+Sweeping $v$ from $-c$ to $c$ with a kinetic sort — only neighbouring events in the current order are
+ever compared — finds every flip in order without re-sorting. Uses the loaded event set (first rows)
+or a random one.
+""")
+flip_col1, flip_col2 = st.columns(2)
+with flip_col1:
+    n_flip_events = st.slider("Events", 100, 20_000, 2_000, 100)
+with flip_col2:
+    flip_spread = st.slider("Time spread / space spread", 1.0, 100.0, 20.0, 1.0,
+                            help="Longer in t means fewer spacelike pairs and fewer flips.")
+
+
+@st.cache_data(max_entries=4)
+def flip_data(t, x):
+    # flip_sequence already counts the flips to enforce max_flips; the full sweep lists each one once.
+    return flip_sequence(t, x, max_flips=3_000_000)
+
+
+if events is not None:
+    flip_t = np.array(events.t[:n_flip_events])
+    flip_x = np.array(events.x[:n_flip_events])
+else:
+    rng = np.random.default_rng(0)
+    flip_x = rng.uniform(-1, 1, n_flip_events)
+    flip_t = rng.uniform(-flip_spread, flip_spread, n_flip_events)
+
+try:
+    flips = flip_data(flip_t, flip_x)
+    n_flips = len(flips.v)
+except ValueError as exc:
+    st.warning(f"Too many flips to list: {exc} Reduce the number of events or increase the time spread.")
+else:
+    done = int(np.searchsorted(flips.v, v))
+    fig, ax = plt.subplots(figsize=(8, 3))
+    ax.hist(flips.v, bins=200, range=(-1, 1), color="steelblue")
+    ax.axvline(v, color="red", linewidth=1.5, label=f"v = {v:+.2f}c")
+    ax.set_xlabel("Critical velocity v/c")
+    ax.set_ylabel("Flips")
+    ax.legend()
+    st.pyplot(fig)
+    plt.close(fig)
+    st.caption(f"{len(flip_t):,} events, {n_flips:,} order flips between −c and c; "
+               f"{done:,} of them happen below v = {v:+.2f}c.")
+    first = order_at(flip_t, flip_x, v)[:10]
+    st.table(pd.DataFrame({"Order in S′": np.arange(1, len(first) + 1), "Event": first,
+                           "t": flip_t[first], "x": flip_x[first]}).round(3))
 
 st.markdown("""
 <hr style='margin-top: 50px; margin-bottom: 10px'>
@@ -0,0 +1,67 @@
+from functools import lru_cache
+
+import numpy as np
+
+# Catalogues are (N, 3) float32 arrays of (ra_deg, dec_deg, magnitude), stored
+# as .npy so they can be memory-mapped instead of read into RAM.
+DEFAULT_CHUNK = 1 << 20
+
+
+def load_catalogue(path):
+    """Memory-map an (N, 3) [ra°, dec°, mag] .npy catalogue."""
+    cat = np.load(path, mmap_mode="r")
+    if cat.ndim != 2 or cat.shape[1] < 3:
+        raise ValueError("Catalogue must have shape (N, 3): ra_deg, dec_deg, mag.")
+    return cat
+
+
+@lru_cache(maxsize=2)
+def synthetic_catalogue(n_stars=1_000_000, seed=0):
+    """Seeded isotropic catalogue with a power-law magnitude distribution, built once per process."""
+    rng = np.random.default_rng(seed)
+    cat = np.empty((n_stars, 3), dtype=np.float32)
+    cat[:, 0] = rng.uniform(0, 360, n_stars)
+    cat[:, 1] = np.degrees(np.arcsin(rng.uniform(-1, 1, n_stars)))
+    # Star counts grow by ~10^0.5 per magnitude; sample mags in [-1, 12].
+    cat[:, 2] = -1 + 2 * np.log10(1 + rng.uniform(0, 10**6.5 - 1, n_stars))
+    cat.setflags(write=False)
+    return cat
+
+
+def aberrate(ra_deg, dec_deg, beta):
+    """Apply the page's aberration formula to catalogue positions, motion along the z axis.
+
+    Uses cos θ' = (cos θ − β) / (1 − β cos θ) with θ the polar angle from +z,
+    keeping the azimuth. Returns observed unit vectors (x, y, z).
+    """
+    ra, dec = np.radians(ra_deg), np.radians(dec_deg)
+    z = np.sin(dec)
+    cos_tp = np.clip((z - beta) / (1 - beta * z), -1, 1)
+    sin_tp = np.sqrt(1 - cos_tp**2)
+    return sin_tp * np.cos(ra), sin_tp * np.sin(ra), cos_tp
+
+
+def density_raster(catalogue, beta, size=600, weight_by_flux=True, chunk=DEFAULT_CHUNK):
+    """Accumulate the observed sky into a (size, size) raster, chunk by chunk.
+
+    The projection matches the page's scatter plot: x′ and y′ of the
+    observed direction on a disk. Each chunk is converted, aberrated and
+    binned with bincount, so memory use is set by `chunk`, not by the
+    catalogue length. With weight_by_flux each star adds 10^(−0.4 m).
+    """
+    raster = np.zeros(size * size)
+    for start in range(0, len(catalogue), chunk):
+        block = np.asarray(catalogue[start:start + chunk], dtype=float)
+        x, y, _ = aberrate(block[:, 0], block[:, 1], beta)
+        col = np.clip(((x + 1) / 2 * size).astype(np.int64), 0, size - 1)
+        row = np.clip(((1 - y) / 2 * size).astype(np.int64), 0, size - 1)
+        w = 10 ** (-0.4 * block[:, 2]) if weight_by_flux else None
+        raster += np.bincount(row * size + col, weights=w, minlength=size * size)
+    return raster.reshape(size, size)
+
+
+def to_image(raster, gamma_exp=0.5):
+    """Log-stretch a density raster into a uint8 greyscale image."""
+    scaled = np.log1p(raster / (np.median(raster[raster > 0]) if np.any(raster > 0) else 1))
+    top = scaled.max() or 1.0
+    return (255 * (scaled / top) ** gamma_exp).astype(np.uint8)
@@ -0,0 +1,177 @@
+import time
+
+import numpy as np
+
+from lorentz_kernel import lorentz_factors
+
+# Units with c = 1. The object moves along +x with speed β; the camera sits at
+# `camera` looking down −z and every frame is the light arriving at t = 0.
+# A photon reaching the camera along direction n was at C + s n at time −s,
+# and in the object's rest frame that locus is again a straight line,
+#   O' = (γ (C_x − x0), C_y, C_z),  d' = (γ (n_x + β), n_y, n_z),
+# so the retarded-time solve becomes an ordinary ray intersection in the rest
+# frame and s (the light travel time) comes out in closed form.
+
+BACKGROUND = np.array([0.04, 0.04, 0.08])
+SIDE_COLOUR = np.array([0.75, 0.78, 0.85])
+
+
+def camera_rays(shape, fov_deg=40.0):
+    """Unit view directions (H, W, 3) for a pinhole camera looking down −z."""
+    h, w = shape
+    half = np.tan(np.radians(fov_deg) / 2)
+    aspect = w / h
+    u = (np.arange(w) + 0.5) / w * 2 - 1
+    v = 1 - (np.arange(h) + 0.5) / h * 2
+    d = np.empty((h, w, 3))
+    d[..., 0] = (u * half * aspect)[None, :]
+    d[..., 1] = (v * half)[:, None]
+    d[..., 2] = -1
+    return d / np.linalg.norm(d, axis=-1, keepdims=True)
+
+
+def rest_frame_rays(directions, camera, beta, x0=0.0, light_delay=True):
+    """Origin and (unnormalised) direction of every pixel's ray in the object frame.
+
+    x0 is the object's lab-frame x position at t = 0. With light_delay=False
+    the ray ignores travel time, giving the purely contracted snapshot that
+    a simultaneous measurement (not a photograph) would record.
+    """
+    g = float(lorentz_factors(beta).gamma)
+    cx, cy, cz = camera
+    origin = np.array([g * (cx - x0), cy, cz])
+    d = directions.copy()
+    d[..., 0] = g * (directions[..., 0] + (beta if light_delay else 0.0))
+    return origin, d
+
+
+def _box_hit(origin, d, half):
+    """Slab test against the box |x_i| ≤ half_i, one component at a time.
+
+    Returns the flat indices of pixels that hit, the ray parameter s, the
+    face axis and the face side (+1 for the face at +half) for those pixels.
+    """
+    n = d.shape[0] * d.shape[1]
+    t_near = np.full(n, -np.inf)
+    t_far = np.full(n, np.inf)
+    axis = np.zeros(n, dtype=np.int8)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for i in range(3):
+            inv = 1 / d[..., i].ravel()
+            t1 = (-half[i] - origin[i]) * inv
+            t2 = (half[i] - origin[i]) * inv
+            near = np.minimum(t1, t2)
+            farther = near > t_near
+            axis[farther] = i
+            np.maximum(t_near, near, out=t_near)
+            np.minimum(t_far, np.maximum(t1, t2), out=t_far)
+    idx = np.flatnonzero((t_far >= t_near) & (t_near > 0))
+    axis = axis[idx]
+    d_axis = d.reshape(-1, 3)[idx, axis]
+    return idx, t_near[idx], axis, -np.sign(d_axis)
+
+
+def render_extruded(texture, beta, shape=(1024, 1024), depth=0.5, camera=(0.0, 0.0, 4.0),
+                    fov_deg=40.0, x0=0.0, light_delay=True):
+    """Photograph of an image extruded into a box of width 1 moving at β along x.
+
+    The front face (facing the camera) carries the texture, the back face a
+    mirrored, dimmed copy, and the sides plain shading with depth stripes so
+    the apparent rotation is easy to see. Returns an
+    (H, W, 3) float image and the per-pixel light travel time s (NaN on
+    background).
+    """
+    tex = np.asarray(texture)
+    if tex.dtype == np.uint8:
+        tex = tex.astype(np.float32) / 255
+    tex = tex[..., :3]
+    th, tw = tex.shape[:2]
+    half = np.array([0.5, 0.5 * th / tw, depth / 2])
+
+    origin, d = rest_frame_rays(camera_rays(shape, fov_deg), camera, beta, x0, light_delay)
+    idx, s, axis, side = _box_hit(origin, d, half)
+    p = origin + s[:, None] * d.reshape(-1, 3)[idx]
+
+    # Texture coordinates on each face: u across the width, v down the height, w through the depth.
+    u = np.clip((p[:, 0] + half[0]) / (2 * half[0]), 0, 1)
+    v = np.clip((half[1] - p[:, 1]) / (2 * half[1]), 0, 1)
+    w = np.clip((p[:, 2] + half[2]) / (2 * half[2]), 0, 1)
+    col = np.minimum((u * tw).astype(np.int64), tw - 1)
+    row = np.minimum((v * th).astype(np.int64), th - 1)
+    shade = np.ones(len(idx), dtype=np.float32)
+    stripes = np.floor(w * 8) % 2 == 0
+
+    on_x, on_y = axis == 0, axis == 1
+    on_side = on_x | on_y
+    back = (axis == 2) & (side < 0)
+    col[back] = tw - 1 - col[back]
+    shade[on_x] = np.where(stripes[on_x], 0.7, 0.45)
+    shade[on_y] = np.where(stripes[on_y], 0.9, 0.7)
+    shade[back] = 0.5
+
+    colour = np.take(tex.reshape(-1, 3), row * tw + col, axis=0)
+    colour[on_side] = SIDE_COLOUR
+    img = np.empty((shape[0] * shape[1], 3), dtype=np.float32)
+    img[:] = BACKGROUND
+    img[idx] = colour * shade[:, None]
+    travel = np.full(shape[0] * shape[1], np.nan)
+    travel[idx] = s
+    return img.reshape(shape + (3,)), travel.reshape(shape)
+
+
+def render_mesh(vertices, triangles, colours, beta, shape=(512, 512), camera=(0.0, 0.0, 4.0),
+                fov_deg=40.0, x0=0.0, light_delay=True):
+    """Photograph of a triangle mesh (rest-frame vertices) moving at β along x.
+
+    Möller–Trumbore intersection, looping over triangles and vectorised over
+    all pixels, so it suits meshes of up to a few hundred faces. colours
+    holds one RGB triple per triangle. Returns the image and travel times.
+    """
+    vertices = np.asarray(vertices, dtype=float)
+    origin, d = rest_frame_rays(camera_rays(shape, fov_deg), camera, beta, x0, light_delay)
+    best = np.full(shape, np.inf)
+    face = np.full(shape, -1)
+    for k, (a, b, c) in enumerate(np.asarray(triangles)):
+        e1, e2 = vertices[b] - vertices[a], vertices[c] - vertices[a]
+        pvec = np.cross(d, e2)
+        det = pvec @ e1
+        with np.errstate(divide="ignore", invalid="ignore"):
+            inv = 1 / det
+            tvec = origin - vertices[a]
+            bu = (pvec @ tvec) * inv
+            qvec = np.cross(tvec, e1)
+            bv = (d @ qvec) * inv
+            s = (qvec @ e2) * inv
+        ok = (np.abs(det) > 1e-12) & (bu >= 0) & (bv >= 0) & (bu + bv <= 1) & (s > 0) & (s < best)
+        best = np.where(ok, s, best)
+        face = np.where(ok, k, face)
+    palette = np.vstack([np.asarray(colours, dtype=float), BACKGROUND])
+    img = palette[face]  # face −1 picks the background row
+    return img.astype(np.float32), np.where(np.isfinite(best), best, np.nan)
+
+
+def beta_sweep(texture, betas, offset=0.0, camera=(0.0, 0.0, 4.0), **kwargs):
+    """Yield (β, image) for each speed, e.g. to build an animation.
+
+    Each frame places the object at x0 = offset + β·C_z, so the light
+    reaching the centre of the view left it when it was at `offset`.
+    """
+    for beta in betas:
+        x0 = offset + beta * camera[2]
+        yield beta, render_extruded(texture, beta, camera=camera, x0=x0, **kwargs)[0]
+
+
+def benchmark(size=1024, beta=0.9, repeats=3):
+    """Seconds per frame for an extruded-image render at size×size, object centred in view."""
+    tex = np.random.default_rng(0).random((256, 256, 3))
+    x0 = beta * 4.0  # where the object is when light from the centre of the view arrives
+    render_extruded(tex, beta, shape=(size, size), x0=x0)
+    t0 = time.perf_counter()
+    for _ in range(repeats):
+        render_extruded(tex, beta, shape=(size, size), x0=x0)
+    return {"seconds_per_frame": (time.perf_counter() - t0) / repeats}
+
+
+if __name__ == "__main__":
+    for key, value in benchmark().items():
+        print(f"{key:>20}: {value:.4g}")
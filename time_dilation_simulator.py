@@ -4,9 +4,7 @@ from mpmath import mp
 import numpy as np
 import plotly.graph_objs as go
 from math import pi, cos, sin
-
-# High precision math
-mp.dps = 100
+from lorentz_kernel import lorentz_factors, lorentz_factors_mp, parse_speed
 
 # Page setup
 st.set_page_config(page_title="Time Dilation Snapshot Simulator", layout="wide")
@@ -73,9 +71,36 @@ def draw_analog_clock(seconds_elapsed, title):
     fig.update_yaxes(scaleanchor="x", scaleratio=1)
     return fig
 
-# Shared logic for snapshot rendering
-def render_snapshot(earth_times, ship_times):
-    final_earth = earth_times[-1]
+# Live digital clocks, ticked by the browser from (elapsed at render, γ)
+def live_clocks_html(elapsed_earth, gamma_float, limit):
+    return f"""
+    <div style="font-family: sans-serif; font-size: 16px; line-height: 1.8; color: inherit;">
+      <b>🟢 Earth Clock:</b> <code id="earth"></code><br>
+      <b>🛸 Ship Clock:</b> <code id="ship"></code>
+    </div>
+    <script>
+      const base = {elapsed_earth!r}, gamma = {gamma_float!r}, limit = {float(limit)!r};
+      const t0 = performance.now();
+      const pad = (n, w) => String(n).padStart(w, "0");
+      function fmt(t) {{
+        const ms = Math.floor((t % 1) * 1000), s = Math.floor(t);
+        return pad(Math.floor(s / 3600) % 24, 2) + ":" + pad(Math.floor(s / 60) % 60, 2) + ":" +
+               pad(s % 60, 2) + "." + pad(ms, 3);
+      }}
+      function tick() {{
+        const earth = Math.min(base + (performance.now() - t0) / 1000, limit);
+        document.getElementById("earth").textContent = fmt(earth);
+        document.getElementById("ship").textContent = fmt(earth / gamma);
+        if (earth < limit) requestAnimationFrame(tick);
+      }}
+      tick();
+    </script>
+    """
+
+# Shared logic for snapshot rendering (analytic, bounded resolution)
+def render_snapshot(final_earth, gamma_float, n_points=200):
+    earth_times = np.linspace(0, final_earth, n_points)
+    ship_times = earth_times / gamma_float
     final_ship = ship_times[-1]
 
     # Digital clocks
@@ -102,49 +127,47 @@ def render_snapshot(earth_times, ship_times):
     )
     plot_area.plotly_chart(fig, use_container_width=True)
 
-# Start simulation
-if start or pause or stop:
+# --- Session state: the server only stores when the run started or where it froze ---
+if "clock_start" not in st.session_state:
+    st.session_state.clock_start = None   # wall-clock time of ▶️, while running
+    st.session_state.clock_frozen = None  # elapsed Earth seconds at ⏸️/⏹️
+
+if start:
+    st.session_state.clock_start = time.time()
+    st.session_state.clock_frozen = None
+elif (pause or stop) and st.session_state.clock_start is not None:
+    elapsed = time.time() - st.session_state.clock_start
+    st.session_state.clock_frozen = min(elapsed, sim_time)
+    st.session_state.clock_start = None
+
+if st.session_state.clock_start is not None or st.session_state.clock_frozen is not None:
     try:
-        v = mp.mpf(v_input.strip())
-        if v < 0 or v >= 1:
+        v, one_minus_v = parse_speed(v_input)
+        if v < 0:
             raise ValueError("Velocity must be in range (0, 1).")
 
-        gamma = 1 / mp.sqrt(1 - v**2)
-        gamma_float = float(gamma)
+        gamma_float = float(lorentz_factors(v, one_minus_v).gamma)
+        gamma = lorentz_factors_mp(v_input, digits=20).gamma  # display only
         status_text.success(f"Lorentz Factor γ = {mp.nstr(gamma, 20)}")
 
-        # Time capture
-        start_time = time.time()
-        earth_times = []
-        ship_times = []
-        stop_triggered = False
-
-        while True:
-            now = time.time()
-            elapsed_earth = now - start_time
-            elapsed_ship = elapsed_earth / gamma_float
-
-            earth_times.append(elapsed_earth)
-            ship_times.append(elapsed_ship)
-
-            # Live update of digital clocks
-            digital_clocks.markdown(f"""
-            **🟢 Earth Clock:** `{format_time(elapsed_earth)}`  
-            **🛸 Ship Clock:** `{format_time(elapsed_ship)}`  
-            """)
-
-            if pause or stop or elapsed_earth >= sim_time:
-                stop_triggered = True
-                break
-
-            time.sleep(0.066)  # ~15 FPS
-
-        if stop_triggered:
-            render_snapshot(earth_times, ship_times)
+        if st.session_state.clock_start is not None:
+            elapsed = time.time() - st.session_state.clock_start
+            if elapsed >= sim_time:
+                # Finished while the browser was ticking: freeze at the end.
+                st.session_state.clock_frozen = float(sim_time)
+                st.session_state.clock_start = None
+
+        if st.session_state.clock_start is not None:
+            digital_clocks.iframe(live_clocks_html(elapsed, gamma_float, sim_time), height=80)
+            status_text.success(f"Lorentz Factor γ = {mp.nstr(gamma, 20)} — clocks running")
+        else:
+            render_snapshot(st.session_state.clock_frozen, gamma_float)
             if stop:
                 status_text.info("⏹️ Simulation stopped.")
-            else:
+            elif pause:
                 status_text.info("⏸️ Simulation paused.")
+            else:
+                status_text.info("✅ Simulation finished.")
 
     except Exception as e:
         status_text.error(f"Error: {e}")
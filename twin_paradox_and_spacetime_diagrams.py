@@ -1,6 +1,8 @@
 import streamlit as st
 import numpy as np
+from lorentz_kernel import gamma as lorentz_gamma
 import matplotlib.pyplot as plt
+from itinerary_optimizer import G_LY_YR2, optimize, worldline
 
 # Set up
 st.set_page_config(page_title="Twin Paradox Simulator", layout="centered")
@@ -34,10 +36,54 @@ unit_factors = {
 }
 T_seconds = T_raw * unit_factors[unit]
 
+# Trip model
+trip_model = st.radio("Trip model", ["Constant speed, instant turnaround", "Rocket itinerary (optimised)"],
+                      horizontal=True)
+if trip_model == "Rocket itinerary (optimised)":
+    st.markdown("""
+Out to a star and back in accelerate–coast–brake legs at constant proper acceleration. Fuel follows the relativistic
+rocket equation: changing rapidity by $\\Delta\\eta$ costs a mass ratio $e^{\\Delta\\eta / w}$ for exhaust speed $w$.
+Batches of candidate itineraries are searched for the shortest trip for the traveler, or the least fuel.
+The speed and time inputs above are replaced by the itinerary.
+""")
+    rk1, rk2 = st.columns(2)
+    with rk1:
+        distance_ly = st.number_input("Distance to the star (light-years)", min_value=0.01, value=4.37, step=0.1)
+        max_g = st.slider("Maximum proper acceleration (g)", 0.1, 5.0, 1.0, 0.1)
+        exhaust = st.slider("Exhaust speed w (fraction of c)", 0.05, 1.0, 1.0, 0.05)
+    with rk2:
+        rocket_goal = st.radio("Minimise", ["Traveler's proper time", "Fuel"])
+        if rocket_goal == "Fuel":
+            tau_limit = st.number_input("Traveler's time limit (years)", min_value=0.01, value=8.0, step=0.5)
+        else:
+            budget = st.number_input("Fuel budget: initial / final mass", min_value=1.01, value=100.0, step=10.0)
+
+
+@st.cache_data(max_entries=8)
+def best_itinerary(distance, g, w, goal, limit):
+    if goal == "Fuel":
+        return optimize(distance, w, max_accel=g * G_LY_YR2, objective="fuel", max_proper_time=limit)
+    return optimize(distance, w, max_accel=g * G_LY_YR2, max_mass_ratio=limit)
+
+
 # ---------------- CALCULATION ----------------
-gamma = 1 / np.sqrt(1 - v**2)
+trip = None
+if trip_model == "Rocket itinerary (optimised)":
+    try:
+        trip = best_itinerary(distance_ly, max_g, exhaust, rocket_goal,
+                              tau_limit if rocket_goal == "Fuel" else budget)
+    except ValueError as exc:
+        st.warning(f"{exc} Showing the constant-speed trip instead.")
+
+if trip is not None:
+    year = unit_factors["years"]
+    T_seconds = trip.metrics.earth_time * year
+    T_raw = T_seconds / unit_factors[unit]
+    v = trip.metrics.peak_speed
+
+gamma = lorentz_gamma(v)
 tau_A = T_seconds
-tau_B = T_seconds / gamma
+tau_B = T_seconds / gamma if trip is None else trip.metrics.proper_time * year
 delta_tau = tau_A - tau_B
 
 # Format outputs to selected unit
@@ -47,10 +93,15 @@ delta_display = delta_tau / unit_factors[unit]
 
 # Worldline data
 t = np.linspace(0, T_display, 300)
-x_out = v * t[t <= T_display/2]
-x_back = v * (T_display - t[t > T_display/2])
-x_travel = np.concatenate((x_out, x_back))
-t_travel = np.concatenate((t[t <= T_display/2], t[t > T_display/2]))
+if trip is None:
+    x_out = v * t[t <= T_display/2]
+    x_back = v * (T_display - t[t > T_display/2])
+    x_travel = np.concatenate((x_out, x_back))
+    t_travel = np.concatenate((t[t <= T_display/2], t[t > T_display/2]))
+else:
+    # The optimised legs in closed form; x in light-(selected unit)
+    t_travel = t
+    x_travel = worldline(trip).position(t * unit_factors[unit] / year) * year / unit_factors[unit]
 
 # ---------------- LAYOUT ----------------
 col3, col4 = st.columns(2)
@@ -62,7 +113,8 @@ with col3:
     ax.plot(x_travel, t_travel, label="Traveling twin", color="red")
     ax.set_xlabel("x")
     ax.set_ylabel(f"t ({unit})")
-    ax.set_xlim(-T_display * v * 1.1, T_display * v * 1.1)
+    x_reach = T_display * v if trip is None else np.abs(x_travel).max()
+    ax.set_xlim(-x_reach * 1.1, x_reach * 1.1)
     ax.set_ylim(0, T_display)
     ax.set_title("Worldlines")
     ax.legend()
@@ -72,6 +124,9 @@ with col3:
 with col4:
     st.subheader("📊 Results")
     st.latex(rf"\gamma = \frac{{1}}{{\sqrt{{1 - v^2}}}} = {gamma:.4f}")
+    if trip is not None:
+        st.caption(f"γ at the peak speed v = {v:.4f}c; the traveler's fuel mass ratio is "
+                   f"{trip.metrics.mass_ratio:,.1f}.")
     st.latex(rf"\tau_A = {T_display:.4f}~\text{{{unit}}}")
     st.latex(rf"\tau_B = {tau_B_display:.4f}~\text{{{unit}}}")
     st.latex(rf"\Delta \tau = {delta_display:.4f}~\text{{{unit}}}")
@@ -1,6 +1,7 @@
 import streamlit as st
 import numpy as np
 import matplotlib.pyplot as plt
+from velocity_composition import compose_collinear, compose_3d
 
 # Set up Streamlit
 st.set_page_config(page_title="Relativistic Velocity Addition", layout="centered")
@@ -45,6 +46,51 @@ ax.legend()
 ax.grid(True)
 st.pyplot(fig)
 
+# Chained composition
+st.subheader("🔗 Chained Velocity Addition")
+st.markdown("Each entry is the speed of the next frame relative to the previous one. Rapidities simply add:")
+st.latex(r"\eta_i = \tanh^{-1}(v_i), \qquad v_{\text{total}} = \tanh\Big(\sum_i \eta_i\Big)")
+chain_input = st.text_input("Speeds in the chain (comma-separated, fractions of c):", "0.5, 0.5, 0.5, 0.9, 0.99")
+
+try:
+    chain = np.array([float(x) for x in chain_input.split(",") if x.strip()])
+    if chain.size == 0 or np.any(np.abs(chain) >= 1):
+        raise ValueError("Enter one or more speeds with |v| < 1.")
+    steps = compose_collinear(chain, cumulative=True)
+    st.latex(r"v_{\text{total}} = %.15f\,c, \qquad 1 - |v_{\text{total}}| = %.6e" % (steps.v[-1], steps.one_minus_v[-1]))
+
+    fig, ax = plt.subplots(figsize=(8, 3.5))
+    ax.semilogy(np.arange(1, chain.size + 1), steps.one_minus_v, marker='o', color='purple')
+    ax.set_xlabel("Frames composed")
+    ax.set_ylabel(r"$1 - |v|$")
+    ax.set_title("Approach to c Along the Chain")
+    ax.grid(True)
+    st.pyplot(fig)
+    plt.close(fig)
+except ValueError as e:
+    st.error(f"Invalid chain: {e}")
+
+# Non-collinear composition
+st.subheader("🧭 Non-Collinear Addition and Thomas–Wigner Rotation")
+st.markdown("Composing boosts in different directions is not commutative, and the result includes a spatial rotation.")
+col_u, col_w = st.columns(2)
+with col_u:
+    ux = st.number_input("u_x", -0.99, 0.99, 0.6, 0.01)
+    uy = st.number_input("u_y", -0.99, 0.99, 0.0, 0.01)
+with col_w:
+    wx = st.number_input("w_x", -0.99, 0.99, 0.0, 0.01)
+    wy = st.number_input("w_y", -0.99, 0.99, 0.8, 0.01)
+
+if ux**2 + uy**2 >= 1 or wx**2 + wy**2 >= 1:
+    st.error("Each velocity must have magnitude below 1.")
+else:
+    pair = np.array([[[ux, uy, 0.0], [wx, wy, 0.0]], [[wx, wy, 0.0], [ux, uy, 0.0]]])
+    res = compose_3d(pair)
+    st.latex(r"u \oplus w = (%.6f,\ %.6f), \qquad w \oplus u = (%.6f,\ %.6f)"
+             % (res.w[0, 0], res.w[0, 1], res.w[1, 0], res.w[1, 1]))
+    st.latex(r"|u \oplus w| = |w \oplus u| = %.10f\,c, \qquad \theta_{\text{Wigner}} = %.6f^\circ"
+             % (1 - res.one_minus_speed[0], np.degrees(res.wigner_angle[0])))
+
 st.markdown("""
 <hr style='margin-top: 50px; margin-bottom: 10px'>
 